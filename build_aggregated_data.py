@@ -142,7 +142,9 @@ def create_yearly_aggregated_files():
 
             # Jahres-Datei speichern
             yearly_file = tf_dir / "nq-2024.csv"
-            combined.to_csv(yearly_file, index=False)
+            tmp_file = yearly_file.with_suffix('.csv.tmp')
+            combined.to_csv(tmp_file, index=False)
+            os.replace(tmp_file, yearly_file)  # Rename statt Überschreiben der alten Datei
             print(f"Jahres-Datei erstellt: {yearly_file} ({len(combined)} Kerzen)")
 
 def main():
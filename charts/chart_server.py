@@ -17,20 +17,36 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 import json
+import re
 import asyncio
+import functools
+import itertools
+import time
+from operator import itemgetter
 from typing import Dict, List, Any
 import uvicorn
 from datetime import datetime, timedelta
+import numpy as np
 import random
 import logging
 import sys
 import os
 
+try:
+    import orjson
+except ImportError:  # orjson ist optional - Fallback auf stdlib json
+    orjson = None
+
+@functools.singledispatch
 def json_serializer(obj):
-    """Custom JSON serializer für datetime und andere nicht-serialisierbare Objekte"""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    elif hasattr(obj, '__dict__'):
+    """
+    Custom JSON serializer für datetime und andere nicht-serialisierbare Objekte
+
+    Typ-Dispatch über functools.singledispatch (dict Lookup nach Typ statt
+    isinstance-Kette) - spezielle Typen sind unten registriert, hier landet
+    nur der Fallback für Objekte mit __dict__.
+    """
+    if hasattr(obj, '__dict__'):
         # Für komplexe Objekte - versuche dict conversion
         try:
             result = {}
@@ -44,9 +60,66 @@ def json_serializer(obj):
             return str(obj)
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
+@json_serializer.register(datetime)
+def _serialize_datetime(obj):
+    return obj.isoformat()
+
+@json_serializer.register(np.generic)
+def _serialize_numpy_scalar(obj):
+    # np.int64 & Co. als native Python-Werte statt TypeError
+    return obj.item()
+
+@json_serializer.register(np.ndarray)
+def _serialize_numpy_array(obj):
+    return obj.tolist()
+
+def dumps_message(message):
+    """
+    Serialisiert WebSocket-Nachrichten - orjson (falls installiert, inkl. NumPy Arrays),
+    sonst stdlib json. Nicht native Typen laufen in beiden Fällen über json_serializer.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                message, default=json_serializer,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ).decode('utf-8')
+        except TypeError:
+            pass  # z.B. Integer > 64 Bit - stdlib json kann mehr Typen
+    return json.dumps(message, default=json_serializer)
+
+def dataframe_to_candles(df):
+    """
+    Konvertiert CSV-DataFrame (time + Open/High/Low/Close/Volume) zu Chart-Kerzen
+
+    Spaltenweise Extraktion über candle_records statt iterrows() - keine Series pro Zeile.
+    """
+    return candle_records(df, times=df['time'].astype('int64').tolist())
+
+_CANDLE_COLUMNS = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+def candles_to_columns(candles):
+    """
+    Array-of-Structs Kerzen -> Struct-of-Arrays ({'time': [...], 'open': [...], ...})
+
+    Die Keys stehen nur einmal statt pro Kerze im JSON - deutlich kleinerer
+    Payload und weniger Objekte beim Parsen im Browser (candlesFromColumns).
+    """
+    return {key: [candle.get(key) for candle in candles] for key in _CANDLE_COLUMNS}
+
+def columns_to_candles(columns):
+    """
+    Struct-of-Arrays ({'time': [...], 'open': [...], ...}) -> Array-of-Structs Kerzen
+
+    Gegenstück zu candles_to_columns für spaltenweise gesendete Chart-Daten.
+    """
+    keys = [key for key in _CANDLE_COLUMNS if key in columns]
+    return [dict(zip(keys, values)) for values in zip(*(columns[key] for key in keys))]
+
 # Füge src Verzeichnis zum Pfad hinzu (ein Verzeichnis höher)
 parent_dir = os.path.dirname(os.path.dirname(__file__))
 sys.path.append(os.path.join(parent_dir, 'src'))
+from data.chart_candles import candle_records
 
 # FastAPI App (Importiere Module später um Startup-Deadlock zu vermeiden)
 app = FastAPI(title="RL Trading Chart Server", version="1.0.0")
@@ -136,12 +209,23 @@ class ChartDataValidator:
     """Data validation and sanitization für LightweightCharts compatibility"""
 
     def __init__(self):
-        self.validation_stats = {'total_validations': 0, 'null_fixes': 0, 'type_fixes': 0}
+        self.validation_stats = {'total_validations': 0, 'null_fixes': 0, 'type_fixes': 0, 'trusted_skips': 0}
+        # CHART_STRICT_VALIDATION=1 erzwingt die volle Prüfung auch für vertrauenswürdige Quellen
+        self.strict = os.environ.get('CHART_STRICT_VALIDATION') == '1'
+
+    def validate_chart_data(self, data, timeframe=None, source="unknown", trusted=False):
+        """
+        Validates and sanitizes chart data before sending to LightweightCharts
 
-    def validate_chart_data(self, data, timeframe=None, source="unknown"):
-        """Validates and sanitizes chart data before sending to LightweightCharts"""
+        trusted=True für Daten aus eigenen Writern (dataframe_to_candles, DataIntegrityGuard),
+        die bereits typisierte, vollständige Kerzen liefern - die per-Kerze Prüfung entfällt.
+        """
         self.validation_stats['total_validations'] += 1
 
+        if trusted and not self.strict and data:
+            self.validation_stats['trusted_skips'] += 1
+            return data
+
         if not data:
             print(f"[DATA-VALIDATOR] WARNING: Empty data from {source}")
             return []
@@ -226,7 +310,7 @@ class ChartDataValidator:
 
     def reset_stats(self):
         """Reset validation statistics"""
-        self.validation_stats = {'total_validations': 0, 'null_fixes': 0, 'type_fixes': 0}
+        self.validation_stats = {'total_validations': 0, 'null_fixes': 0, 'type_fixes': 0, 'trusted_skips': 0}
 
 # REVOLUTIONARY: Unified Price Repository - Single Source of Truth für konsistente Endkurse
 class UnifiedPriceRepository:
@@ -553,7 +637,6 @@ class EventBasedTransaction:
 
     def begin_transaction(self, transaction_id=None):
         """Start transaction with Skip Events backup"""
-        import time
         self.transaction_id = transaction_id or f"event_tx_{int(time.time())}"
         self.is_active = True
 
@@ -622,19 +705,10 @@ try:
         print(f"CSV gelesen: {len(df)} Zeilen")
 
         # Konvertiere zu Chart-Format (neue Struktur: Date, Time, OHLCV)
-        for _, row in df.iterrows():
-            # DateTime aus Date und Time kombinieren
-            dt_str = f"{row['Date']} {row['Time']}"
-            dt = pd.to_datetime(dt_str, format='mixed', dayfirst=True)
-
-            initial_chart_data.append({
-                'time': int(dt.timestamp()),  # Unix Timestamp für TradingView
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close']),
-                'volume': int(row['Volume'])
-            })
+        # DateTime aus Date und Time kombinieren - ein Parse-Aufruf für alle Zeilen
+        dt = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='mixed', dayfirst=True)
+        df = df.assign(time=(dt - pd.Timestamp('1970-01-01')) // pd.Timedelta(seconds=1))  # Unix Timestamp für TradingView
+        initial_chart_data = dataframe_to_candles(df)
         print(f"ERFOLG: {len(initial_chart_data)} NQ-Kerzen geladen!")
     else:
         print(f"FEHLER: CSV nicht gefunden: {csv_path}")
@@ -663,10 +737,12 @@ class ConnectionManager:
         await websocket.accept()
         self.active_connections.append(websocket)
 
-        # Sende aktuellen Chart-State an neuen Client
+        # Sende aktuellen Chart-State an neuen Client - Kerzen spaltenweise
+        state = dict(self.chart_state)
+        state['columns'] = candles_to_columns(state.pop('data', None) or [])
         await self.send_personal_message({
             'type': 'initial_data',
-            'data': self.chart_state
+            'data': state
         }, websocket)
 
     def disconnect(self, websocket: WebSocket):
@@ -674,29 +750,43 @@ class ConnectionManager:
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
 
+    @staticmethod
+    def _serialize_message(message: dict) -> str:
+        """Serialisiert eine Nachricht (ohne nicht-serialisierbare DataFrames) zu JSON-Text"""
+        # Erstelle eine serialisierbare Kopie der Daten ohne DataFrame
+        if 'data' in message and isinstance(message['data'], dict):
+            serializable_data = message['data'].copy()
+            # Entferne nicht-serialisierbare DataFrame-Objekte
+            if 'raw_1m_data' in serializable_data:
+                del serializable_data['raw_1m_data']
+            message = message.copy()
+            message['data'] = serializable_data
+
+        # Verwende custom serializer für datetime Objekte
+        return dumps_message(message)
+
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """Nachricht an spezifischen Client senden"""
         try:
-            # Erstelle eine serialisierbare Kopie der Daten ohne DataFrame
-            if 'data' in message and isinstance(message['data'], dict):
-                serializable_data = message['data'].copy()
-                # Entferne nicht-serialisierbare DataFrame-Objekte
-                if 'raw_1m_data' in serializable_data:
-                    del serializable_data['raw_1m_data']
-                message = message.copy()
-                message['data'] = serializable_data
-
-            # Verwende custom serializer für datetime Objekte
-            await websocket.send_text(json.dumps(message, default=json_serializer))
+            await websocket.send_text(self._serialize_message(message))
         except Exception as e:
             logging.error(f"Error sending message: {e}")
             # Debug: Drucke Details für JSON Serialization Fehler
             if "not JSON serializable" in str(e):
                 logging.error(f"Message contents: {message}")
 
+    async def _send_text(self, text: str, websocket: WebSocket):
+        """Bereits serialisierte Nachricht an einen Client senden"""
+        try:
+            await websocket.send_text(text)
+        except Exception as e:
+            logging.error(f"Error sending message: {e}")
+
     async def broadcast(self, message: dict):
         """🛡️ CRASH-SAFE Nachricht an alle verbundenen Clients senden"""
-        print(f"Broadcast: {len(self.active_connections)} aktive Verbindungen, Nachricht: {message.get('type', 'unknown')}")
+        # Pro Nachricht nur Debug-Logging (lazy formatiert) statt print auf stdout
+        logging.debug("Broadcast: %d aktive Verbindungen, Nachricht: %s",
+                      len(self.active_connections), message.get('type', 'unknown'))
 
         if not self.active_connections:
             print("WARNUNG: Keine aktiven WebSocket-Verbindungen für Broadcast!")
@@ -707,14 +797,22 @@ class ConnectionManager:
             print(f"[DATA-GUARD] [BLOCKED] BLOCKED invalid websocket message: {message.get('type', 'unknown')}")
             return
 
-        # Sende parallel an alle Clients
+        # Einmal serialisieren, dann parallel an alle Clients senden
+        try:
+            text = self._serialize_message(message)
+        except Exception as e:
+            logging.error(f"Error serializing broadcast message: {e}")
+            if "not JSON serializable" in str(e):
+                logging.error(f"Message contents: {message}")
+            return
+
         tasks = []
         for connection in self.active_connections.copy():
-            tasks.append(self.send_personal_message(message, connection))
+            tasks.append(self._send_text(text, connection))
 
         # Warte auf alle Sends (mit Error-Handling)
         await asyncio.gather(*tasks, return_exceptions=True)
-        print(f"Broadcast abgeschlossen an {len(self.active_connections)} Clients")
+        logging.debug("Broadcast abgeschlossen an %d Clients", len(self.active_connections))
 
     def update_chart_state(self, update_data: dict):
         """Chart-State aktualisieren"""
@@ -885,8 +983,9 @@ class ChartDataCache:
                     df['datetime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='mixed', dayfirst=True)
                     df['time'] = df['datetime'].astype(int) // 10**9  # Unix timestamp für TradingView
 
-                    # Sortierung nach Datum sicherstellen
-                    df = df.sort_values('datetime')
+                    # Sortierung nach Datum sicherstellen - CSVs sind i.d.R. chronologisch, O(N) Check statt Sortierung
+                    if not df['datetime'].is_monotonic_increasing:
+                        df = df.sort_values('datetime')
 
                     self.timeframe_data[timeframe] = df
                     self.loaded_timeframes.add(timeframe)
@@ -929,8 +1028,9 @@ class ChartDataCache:
                     df['datetime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='mixed', dayfirst=True)
                     df['time'] = df['datetime'].astype(int) // 10**9  # Unix timestamp für TradingView
 
-                    # Sortierung nach Datum sicherstellen
-                    df = df.sort_values('datetime')
+                    # Sortierung nach Datum sicherstellen - CSVs sind i.d.R. chronologisch, O(N) Check statt Sortierung
+                    if not df['datetime'].is_monotonic_increasing:
+                        df = df.sort_values('datetime')
 
                     self.timeframe_data[timeframe] = df
                     self.loaded_timeframes.add(timeframe)
@@ -1024,16 +1124,7 @@ class ChartDataCache:
         result_df = df.iloc[start_idx:end_idx]
 
         # Konvertiere zu Chart-Format
-        chart_data = []
-        for _, row in result_df.iterrows():
-            chart_data.append({
-                'time': int(row['time']),
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close']),
-                'volume': int(row['Volume'])
-            })
+        chart_data = dataframe_to_candles(result_df)
 
         # Berechne sichtbaren Bereich (letzten visible_candles von total_candles)
         data_count = len(chart_data)
@@ -1210,8 +1301,6 @@ class TimeframeSyncManager:
 
     def _get_candle_start_time(self, datetime_obj, timeframe_minutes):
         """Berechnet den Start-Zeitpunkt einer Kerze für einen Timeframe"""
-        from datetime import datetime, timedelta
-
         # Round down zur nächsten Timeframe-Boundary
         minutes_since_midnight = datetime_obj.hour * 60 + datetime_obj.minute
         candle_boundary = (minutes_since_midnight // timeframe_minutes) * timeframe_minutes
@@ -1259,6 +1348,7 @@ class CSVLoader:
 
     def __init__(self):
         self.data_cache = {}  # {timeframe: pandas.DataFrame}
+        self.time_index = {}  # {timeframe: numpy datetime64 array} - sortiert für Binary Search
         self.available_timeframes = ["1m", "2m", "3m", "5m", "15m", "30m", "1h", "4h"]
         print("[CSVLoader] Initialized multi-timeframe CSV loader")
 
@@ -1301,8 +1391,13 @@ class CSVLoader:
                     if 'datetime' not in df.columns:
                         df['datetime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='mixed', dayfirst=True)
 
+                    # Sortierung sicherstellen - Voraussetzung für searchsorted in get_next_candle
+                    if not df['datetime'].is_monotonic_increasing:
+                        df = df.sort_values('datetime').reset_index(drop=True)
+
                     # Cache the data
                     self.data_cache[timeframe] = df
+                    self.time_index[timeframe] = df['datetime'].to_numpy()
                     print(f"[CSVLoader] SUCCESS: Cached {len(df)} {timeframe} candles")
                     return df
 
@@ -1315,10 +1410,16 @@ class CSVLoader:
 
     def preload_all_timeframes(self):
         """Lädt alle verfügbaren Timeframes in den Cache"""
+        from concurrent.futures import ThreadPoolExecutor
+
         print("[CSVLoader] Preloading all timeframes...")
 
-        for timeframe in self.available_timeframes:
-            df = self.load_timeframe_data(timeframe)
+        # Parallel laden - pandas gibt beim CSV-Parsing den GIL frei,
+        # Wall-Time ~ langsamste Datei statt Summe aller Dateien
+        with ThreadPoolExecutor(max_workers=len(self.available_timeframes)) as executor:
+            results = list(executor.map(self.load_timeframe_data, self.available_timeframes))
+
+        for timeframe, df in zip(self.available_timeframes, results):
             if df is not None:
                 print(f"[CSVLoader] Preloaded {timeframe}: {len(df)} candles")
             else:
@@ -1330,13 +1431,16 @@ class CSVLoader:
         if df is None:
             return None
 
+        import numpy as np
         import pandas as pd
 
-        target_datetime = pd.Timestamp(current_datetime)
-        future_candles = df[df['datetime'] > target_datetime].sort_values('datetime')
+        # O(log n) Binary Search statt Boolean-Mask über das ganze Jahr
+        times = self.time_index[timeframe]
+        target_datetime = pd.Timestamp(current_datetime).to_datetime64()
+        next_index = int(np.searchsorted(times, target_datetime, side='right'))
 
-        if len(future_candles) > 0:
-            next_row = future_candles.iloc[0]
+        if next_index < len(times):
+            next_row = df.iloc[next_index]
 
             candle = {
                 'time': int(next_row['datetime'].timestamp()),
@@ -1612,7 +1716,6 @@ class UnifiedTimeManager:
         print(f"[CSV-REGISTRY] Loading full CSV basis for {timeframe}")
         try:
             # Verwende die Repository-Funktion mit großem Datum-Range und ohne max_candles
-            from datetime import datetime, timedelta
             end_date = datetime.now().date()
             start_date = end_date - timedelta(days=365)  # 1 Jahr Daten
 
@@ -1646,16 +1749,17 @@ class UnifiedTimeManager:
 
         # STRATEGY: Skip-Kerzen haben Priorität über CSV-Kerzen zur gleichen Zeit
         mixed_data = csv_candles.copy()
+        # Zeit -> Position für O(1) Suche statt linearem Scan pro Skip-Kerze
+        time_positions = {}
+        for i, candle in enumerate(mixed_data):
+            time_positions.setdefault(candle.get('time'), i)
+        needs_sort = False
 
         for skip_candle in skip_candles:
             skip_time = skip_candle.get('time')
             if skip_time:
                 # Suche CSV-Kerze zur gleichen Zeit
-                existing_index = None
-                for i, csv_candle in enumerate(mixed_data):
-                    if csv_candle.get('time') == skip_time:
-                        existing_index = i
-                        break
+                existing_index = time_positions.get(skip_time)
 
                 if existing_index is not None:
                     # Ersetze CSV-Kerze mit Skip-Kerze
@@ -1663,10 +1767,13 @@ class UnifiedTimeManager:
                     print(f"[SKIP-ISOLATION] Replaced CSV candle at time {skip_time} with skip candle")
                 else:
                     # Füge Skip-Kerze hinzu und sortiere
+                    time_positions[skip_time] = len(mixed_data)
                     mixed_data.append(skip_candle)
+                    needs_sort = True
 
-        # Sortiere nach Zeit und begrenze
-        mixed_data.sort(key=lambda x: x.get('time', 0))
+        # Sortiere nach Zeit (nur wenn Kerzen angehängt wurden - Ersetzungen behalten die Reihenfolge) und begrenze
+        if needs_sort:
+            mixed_data.sort(key=lambda x: x.get('time', 0))
         result = mixed_data[-max_candles:] if len(mixed_data) > max_candles else mixed_data
 
         print(f"[SKIP-ISOLATION] Mixed data for {timeframe}: {len(csv_candles)} CSV + {len(skip_candles)} skip = {len(result)} total")
@@ -1862,7 +1969,7 @@ class TimeframeDataRepository:
 
         # Enhanced Cache mit Zeit-Validierung
         self.validated_cache = {}  # {timeframe: {data: df, last_validated_time: datetime}}
-        self.candle_index_cache = {}  # {timeframe: {time: index}} für schnelle Suche
+        self.candle_index_cache = {}  # {timeframe: datetime64[ns] Vektor} für schnelle Suche
 
         print("[TimeframeDataRepository] Smart Data Repository initialisiert")
 
@@ -1933,7 +2040,11 @@ class TimeframeDataRepository:
             if df[time_column].dtype == 'object':
                 df[time_column] = pd.to_datetime(df[time_column])
             print(f"[DEBUG] Suche nach datetime > {current_time}")
-            next_candles = df[df[time_column] > current_time]
+            position = self._time_index_position(timeframe, df, current_time, 'right')
+            if position is not None:
+                next_candles = df.iloc[position:position + 1]
+            else:
+                next_candles = df[df[time_column] > current_time]
 
         print(f"[DEBUG] Gefundene next_candles: {len(next_candles)} Kerzen")
         if len(next_candles) > 0:
@@ -1982,6 +2093,7 @@ class TimeframeDataRepository:
 
         # Datums-Filterung
         time_column = 'datetime' if 'datetime' in df.columns else 'time'
+        time_values = None
         if time_column == 'time' and df[time_column].dtype == 'int64':
             # Timestamp format
             start_timestamp = start_date.timestamp()
@@ -1994,7 +2106,14 @@ class TimeframeDataRepository:
             # Datetime format
             if df[time_column].dtype == 'object':
                 df[time_column] = pd.to_datetime(df[time_column])
-            if end_date:
+            start = self._time_index_position(timeframe, df, start_date, 'left')
+            stop = self._time_index_position(timeframe, df, end_date, 'right') if end_date else len(df)
+            if start is not None and stop is not None:
+                # Sortierter Zeitvektor: Bereich per Binärsuche statt Vergleichsmaske
+                stop = max(start, min(stop, start + max_candles))
+                filtered_df = df.iloc[start:stop]
+                time_values = self.candle_index_cache[timeframe][start:stop]
+            elif end_date:
                 filtered_df = df[(df[time_column] >= start_date) & (df[time_column] <= end_date)]
             else:
                 filtered_df = df[df[time_column] >= start_date]
@@ -2004,10 +2123,7 @@ class TimeframeDataRepository:
             filtered_df = filtered_df.head(max_candles)
 
         # Konvertiere zu Liste von Candle-Dicts
-        candles = []
-        for _, row in filtered_df.iterrows():
-            candle_data = self._format_candle_data(row, timeframe)
-            candles.append(candle_data)
+        candles = self._format_candles(filtered_df, timeframe, time_values)
 
         print(f"[TimeframeDataRepository] [DATA] {len(candles)} Kerzen geladen für {timeframe} ({start_date} bis {end_date or 'Ende'})")
         return candles
@@ -2097,10 +2213,61 @@ class TimeframeDataRepository:
             'timeframe': timeframe
         }
 
+    def _format_candles(self, df, timeframe, time_values=None):
+        """
+        Spaltenweise Variante von _format_candle_data für einen ganzen DataFrame
+
+        Bei datetime-Spalte (Normalfall, CSVLoader legt sie immer an) werden
+        Zeitstempel und OHLCV als Arrays extrahiert - keine Series pro Zeile.
+        time_values: optionaler Ausschnitt aus candle_index_cache passend zu df
+        """
+        if df.empty:
+            return []
+
+        if 'datetime' not in df.columns:
+            return [self._format_candle_data(row, timeframe) for _, row in df.iterrows()]
+
+        datetimes = pd.to_datetime(df['datetime'])
+        if time_values is None:
+            time_values = datetimes.to_numpy(dtype='datetime64[ns]')
+        # Sekunden seit Epoch wie Timestamp.timestamp() (naive Zeiten als UTC)
+        timestamps = (time_values.astype('int64') / 10**9).tolist()
+
+        return candle_records(df, times=timestamps, extra={
+            'datetime': datetimes.tolist(),
+            'timeframe': itertools.repeat(timeframe),
+        })
+
     def _build_time_index_cache(self, df, timeframe):
-        """Erstellt Index-Cache für schnelle Zeit-basierte Suchen"""
-        # Implementierung bei Bedarf für Performance-Optimierung
-        pass
+        """
+        Erstellt Index-Cache für schnelle Zeit-basierte Suchen
+
+        Einmal pro geladenem DataFrame wird die datetime-Spalte als gemeinsamer
+        datetime64[ns] Vektor abgelegt - Bereichs- und Nächste-Kerze-Suchen laufen
+        dann per np.searchsorted, _format_candles nutzt denselben Vektor für
+        die Zeitstempel. Nur für naive, aufsteigend sortierte Zeiten.
+        """
+        self.candle_index_cache.pop(timeframe, None)
+        if 'datetime' not in df.columns:
+            return
+
+        datetimes = df['datetime']
+        if not pd.api.types.is_datetime64_dtype(datetimes.dtype) or not datetimes.is_monotonic_increasing:
+            return
+
+        self.candle_index_cache[timeframe] = datetimes.to_numpy(dtype='datetime64[ns]')
+
+    def _time_index_position(self, timeframe, df, when, side):
+        """
+        Einfügeposition von when im Zeitvektor (wie np.searchsorted)
+
+        Returns:
+            int oder None wenn kein passender Index-Cache vorhanden ist
+        """
+        time_values = self.candle_index_cache.get(timeframe)
+        if time_values is None or len(time_values) != len(df) or getattr(when, 'tzinfo', None) is not None:
+            return None
+        return int(np.searchsorted(time_values, pd.Timestamp(when).to_datetime64(), side=side))
 
 # Global Data Repository Instance
 timeframe_data_repository = None  # Wird nach CSVLoader-Initialisierung erstellt
@@ -2164,6 +2331,43 @@ class DataIntegrityGuard:
 
         return True
 
+    @staticmethod
+    def _valid_candle_mask(data):
+        """
+        Vektorisierte Variante von validate_candle_for_chart für eine ganze Kerzenliste
+
+        Returns:
+            (mask, block) - bool Maske und (N, 5) float64 Block [time, open, high, low, close],
+            None wenn die Werte nicht rein numerisch sind (dann Validierung pro Kerze)
+        """
+        try:
+            block = np.array([(candle['time'], candle['open'], candle['high'], candle['low'], candle['close'])
+                              for candle in data])
+        except (KeyError, TypeError, IndexError, ValueError):
+            return None
+        if block.ndim != 2 or block.dtype.kind not in 'biuf':
+            return None
+
+        block = block.astype(np.float64)
+        times, opens, highs, lows, closes = block.T
+        prices = block[:, 1:]
+        mask = (np.isfinite(block).all(axis=1) & (times > 0)
+                & (lows <= highs)
+                & (opens >= lows) & (opens <= highs)
+                & (closes >= lows) & (closes <= highs)
+                & (prices > 0).all(axis=1) & (prices <= 1000000).all(axis=1))
+        return mask, block
+
+    @staticmethod
+    def _with_volume(safe_candle, candle):
+        """Übernimmt optionales Volume (als int) in eine bereinigte Kerze"""
+        if 'volume' in candle and candle['volume'] is not None:
+            try:
+                safe_candle['volume'] = int(float(candle['volume']))
+            except (ValueError, TypeError):
+                safe_candle['volume'] = 0
+        return safe_candle
+
     @staticmethod
     def sanitize_chart_data(data, source="unknown"):
         """BULLETPROOF Chart-Daten Bereinigung - garantiert nie leere/korrupte Daten"""
@@ -2174,27 +2378,33 @@ class DataIntegrityGuard:
         original_count = len(data)
         validated_data = []
 
-        for i, candle in enumerate(data):
-            if DataIntegrityGuard.validate_candle_for_chart(candle):
-                # EXTRA-SAFE: Explizite Typ-Konversion
-                safe_candle = {
-                    'time': int(float(candle['time'])),
-                    'open': float(candle['open']),
-                    'high': float(candle['high']),
-                    'low': float(candle['low']),
-                    'close': float(candle['close'])
-                }
-
-                # Optional: Volume
-                if 'volume' in candle and candle['volume'] is not None:
-                    try:
-                        safe_candle['volume'] = int(float(candle['volume']))
-                    except (ValueError, TypeError):
-                        safe_candle['volume'] = 0
-
-                validated_data.append(safe_candle)
-            else:
-                print(f"[DATA-GUARD] Filtered invalid candle #{i} from {source}: {candle}")
+        fast_path = DataIntegrityGuard._valid_candle_mask(data)
+        if fast_path is not None:
+            # Rein numerische Kerzen: Validierung als NumPy Maske, Werte aus dem Block
+            mask, block = fast_path
+            times = block[:, 0].astype(np.int64).tolist()
+            ohlc = block[:, 1:].tolist()
+            for i in np.flatnonzero(mask).tolist():
+                open_val, high_val, low_val, close_val = ohlc[i]
+                safe_candle = {'time': times[i], 'open': open_val, 'high': high_val,
+                               'low': low_val, 'close': close_val}
+                validated_data.append(DataIntegrityGuard._with_volume(safe_candle, data[i]))
+            for i in np.flatnonzero(~mask).tolist():
+                print(f"[DATA-GUARD] Filtered invalid candle #{i} from {source}: {data[i]}")
+        else:
+            for i, candle in enumerate(data):
+                if DataIntegrityGuard.validate_candle_for_chart(candle):
+                    # EXTRA-SAFE: Explizite Typ-Konversion
+                    safe_candle = {
+                        'time': int(float(candle['time'])),
+                        'open': float(candle['open']),
+                        'high': float(candle['high']),
+                        'low': float(candle['low']),
+                        'close': float(candle['close'])
+                    }
+                    validated_data.append(DataIntegrityGuard._with_volume(safe_candle, candle))
+                else:
+                    print(f"[DATA-GUARD] Filtered invalid candle #{i} from {source}: {candle}")
 
         filtered_count = original_count - len(validated_data)
         if filtered_count > 0:
@@ -2204,7 +2414,6 @@ class DataIntegrityGuard:
         if len(validated_data) == 0:
             print(f"[DATA-GUARD] WARNING: All candles filtered from {source}! Creating minimal fallback.")
             # Erstelle minimal-fallback um Chart-Crash zu verhindern
-            import time
             current_time = int(time.time())
             validated_data = [{
                 'time': current_time,
@@ -2789,16 +2998,7 @@ async def startup_event():
                 df_1m['time'] = df_1m['datetime'].astype(int) // 10**9
 
                 # Convert to chart format for PriceRepository
-                chart_data_1m = []
-                for _, row in df_1m.iterrows():
-                    chart_data_1m.append({
-                        'time': int(row['time']),
-                        'open': float(row['Open']),
-                        'high': float(row['High']),
-                        'low': float(row['Low']),
-                        'close': float(row['Close']),
-                        'volume': int(row['Volume'])
-                    })
+                chart_data_1m = dataframe_to_candles(df_1m)
 
                 # Initialize price repository
                 price_repository.initialize_with_1m_data(chart_data_1m)
@@ -2823,13 +3023,28 @@ async def startup_event():
 @app.get("/")
 async def get_chart():
     """Haupt-Chart-Seite"""
-    return HTMLResponse(content="""
+    return HTMLResponse(content=_chart_page_body())
+
+# Komplette console.log(...); Statements (auch mehrzeilig) - ohne CHART_DEBUG_JS=1 aus der Seite entfernt
+_CONSOLE_LOG_RE = re.compile(r"^[ \t]*console\.log\(.*?\);[ \t]*\n", re.MULTILINE | re.DOTALL)
+
+@functools.lru_cache(maxsize=1)
+def _chart_page_body():
+    """
+    Statisches Chart-HTML - einmal UTF-8 kodiert statt bei jedem Request
+
+    Ohne CHART_DEBUG_JS=1 werden die console.log Statements beim ersten Aufbau
+    entfernt - weniger Bytes und kein Logging (samt Argument-Auswertung) im Browser.
+    console.warn/error und serverLog bleiben erhalten.
+    """
+    html = """
 <!DOCTYPE html>
 <html>
 <head>
     <title>RL Trading Chart - Realtime</title>
     <meta charset="utf-8">
-    <script src="https://unpkg.com/lightweight-charts@4.1.3/dist/lightweight-charts.standalone.production.js"></script>
+    <!-- defer: blockiert das Parsen nicht, läuft vor DOMContentLoaded (dort startet initChart) -->
+    <script defer src="https://unpkg.com/lightweight-charts@4.1.3/dist/lightweight-charts.standalone.production.js"></script>
     <style>
         body { margin: 0; padding: 0; background: #000; font-family: Arial, sans-serif; }
         #chart_container { width: calc(100% - 35px); margin-left: 35px; position: fixed; top: 80px; bottom: 40px; } /* Angepasst für linke Sidebar */
@@ -2893,7 +3108,20 @@ async def get_chart():
         .timeframe-btn.active { background: #089981; color: #fff; font-weight: bold; }
         .timeframe-btn:disabled { background: #1a1a1a; color: #555; cursor: not-allowed; }
 
-        /* Intelligent Zoom Toast Animations */
+        /* Intelligent Zoom Toast - einmal im Stylesheet statt Inline-CSS pro Toast */
+        .zoom-toast {
+            position: fixed;
+            top: 80px;
+            right: 20px;
+            background: rgba(8, 153, 129, 0.9);
+            color: white;
+            padding: 8px 12px;
+            border-radius: 4px;
+            font-size: 11px;
+            z-index: 10000;
+            animation: slideIn 0.3s ease-out;
+        }
+        .zoom-toast.closing { animation: slideOut 0.3s ease-in; }
         @keyframes slideIn {
             from { transform: translateX(100%); opacity: 0; }
             to { transform: translateX(0); opacity: 1; }
@@ -3734,25 +3962,14 @@ async def get_chart():
             showZoomNotification(message) {
                 // Erstelle Toast-Benachrichtigung
                 const toast = document.createElement('div');
+                toast.className = 'zoom-toast';
                 toast.textContent = message;
-                toast.style.cssText = `
-                    position: fixed;
-                    top: 80px;
-                    right: 20px;
-                    background: rgba(8, 153, 129, 0.9);
-                    color: white;
-                    padding: 8px 12px;
-                    border-radius: 4px;
-                    font-size: 11px;
-                    z-index: 10000;
-                    animation: slideIn 0.3s ease-out;
-                `;
 
                 document.body.appendChild(toast);
 
                 // Auto-remove nach 2 Sekunden
                 setTimeout(() => {
-                    toast.style.animation = 'slideOut 0.3s ease-in';
+                    toast.classList.add('closing');
                     setTimeout(() => toast.remove(), 300);
                 }, 2000);
             }
@@ -3928,25 +4145,34 @@ async def get_chart():
             // Observer Pattern (subscribeVisibleLogicalRangeChange) übernimmt Redraw bei Zoom/Pan
             // Kein continuous redraw mehr → Massive Performance-Verbesserung + stabile Koordinaten
 
-            // Responsive Resize - VEREINFACHT (kein Cache mehr!)
+            // Responsive Resize - max. ein Layout-Read + Resize pro Frame
+            // (resize feuert beim Ziehen dutzendfach pro Frame)
+            let resizeScheduled = false;
+
             window.addEventListener('resize', () => {
-                chart.applyOptions({
-                    width: chartContainer.clientWidth,
-                    height: chartContainer.clientHeight
+                if (resizeScheduled) return;
+                resizeScheduled = true;
+                requestAnimationFrame(() => {
+                    resizeScheduled = false;
+
+                    // Erst lesen, dann schreiben - kein Layout-Thrashing
+                    const width = chartContainer.clientWidth;
+                    const height = chartContainer.clientHeight;
+                    chart.applyOptions({ width, height });
+
+                    // ⭐ Position Boxes mitskalieren bei Window Resize (MULTI-BOX Support)
+                    if (window.positionBoxManager && window.positionBoxManager.count() > 0 && window.positionCanvas) {
+                        // Update Canvas Größe
+                        const canvas = window.positionCanvas;
+                        canvas.width = width;
+                        canvas.height = height;
+
+                        // ⭐ EINFACH: Zeichne alle Boxes neu (Koordinaten werden frisch berechnet)
+                        window.positionBoxManager.drawAll();
+                        console.log(`🔄 ${window.positionBoxManager.count()} Position Boxes neu gezeichnet nach Window Resize`);
+                    }
                 });
-
-                // ⭐ Position Boxes mitskalieren bei Window Resize (MULTI-BOX Support)
-                if (window.positionBoxManager && window.positionBoxManager.count() > 0 && window.positionCanvas) {
-                    // Update Canvas Größe
-                    const canvas = window.positionCanvas;
-                    canvas.width = chartContainer.clientWidth;
-                    canvas.height = chartContainer.clientHeight;
-
-                    // ⭐ EINFACH: Zeichne alle Boxes neu (Koordinaten werden frisch berechnet)
-                    window.positionBoxManager.drawAll();
-                    console.log(`🔄 ${window.positionBoxManager.count()} Position Boxes neu gezeichnet nach Window Resize`);
-                }
-            });
+            }, { passive: true });
 
             // LADE ECHTE NQ-DATEN über WebSocket
             console.log('🔄 Lade echte NQ-Daten...');
@@ -4392,6 +4618,16 @@ async def get_chart():
             return true;
         }
 
+        // Struct-of-Arrays (initial_data 'columns') -> Kerzen-Objekte für setData
+        function candlesFromColumns(columns) {
+            const keys = Object.keys(columns).filter(key => columns[key].some(value => value !== null));
+            return columns.time.map((_, i) => {
+                const candle = {};
+                for (const key of keys) candle[key] = columns[key][i];
+                return candle;
+            });
+        }
+
         function validateCandleData(data, isSkipGenerated = false) {
             if (!data || data.length === 0) return [];
 
@@ -4452,6 +4688,9 @@ async def get_chart():
                 case 'initial_data':
                     if (!isInitialized) initChart();
 
+                    if (message.data.columns) {
+                        message.data.data = candlesFromColumns(message.data.columns);
+                    }
                     const data = message.data.data;
                     if (data && data.length > 0) {
                         const validatedData = validateCandleData(data);
@@ -5647,7 +5886,7 @@ async def get_chart():
 
             // Mouse Events für Resize
             canvas.addEventListener('mousedown', onCanvasMouseDown);
-            canvas.addEventListener('mousemove', onCanvasMouseMove);
+            canvas.addEventListener('mousemove', onCanvasMouseMove, { passive: true });
             canvas.addEventListener('mouseup', onCanvasMouseUp);
 
             console.log('📄 Canvas Overlay erstellt und Manager initialisiert');
@@ -5699,7 +5938,7 @@ async def get_chart():
                     canvas.style.pointerEvents = 'none';  // Events gehen zum Chart durch
                     canvas.style.cursor = 'default';
                 }
-            });
+            }, { passive: true });
         }
 
         // ⭐ NEUE FUNKTION: Prüft ob Punkt über Buttons (X oder Buy) liegt
@@ -7267,10 +7506,10 @@ async def get_chart():
             }
         });
 
-        // Modal schließen bei Klick außerhalb
-        document.addEventListener('click', function(event) {
-            const modal = document.getElementById('dateModal');
-            if (event.target === modal) {
+        // Modal schließen bei Klick außerhalb (auf den Overlay-Hintergrund) - Listener
+        // am Modal selbst statt an document, andere Klicks laufen nicht durch
+        document.getElementById('dateModal').addEventListener('click', function(event) {
+            if (event.target === this) {
                 closeDateModal();
             }
         });
@@ -7440,16 +7679,14 @@ async def get_chart():
                 console.error('❌ clearAll Button nicht gefunden');
             }
 
-            // Registriere Timeframe Button Event Handlers
-            const timeframeButtons = document.querySelectorAll('.timeframe-btn');
-            timeframeButtons.forEach(btn => {
-                const timeframe = btn.getAttribute('data-timeframe');
-                btn.addEventListener('click', () => changeTimeframe(timeframe));
-                console.log(`✅ Timeframe Button ${timeframe} Event Handler registriert`);
-            });
-
-            if (timeframeButtons.length > 0) {
-                console.log(`✅ ${timeframeButtons.length} Timeframe Buttons Event Handler registriert`);
+            // Timeframe Buttons - ein delegierter Listener an der Gruppe statt einer pro Button
+            const timeframeGroup = document.querySelector('.timeframe-group');
+            if (timeframeGroup) {
+                timeframeGroup.addEventListener('click', (event) => {
+                    const btn = event.target.closest('.timeframe-btn');
+                    if (btn && !btn.disabled) changeTimeframe(btn.dataset.timeframe);
+                });
+                console.log('✅ Timeframe Buttons Event Handler registriert (delegiert)');
             } else {
                 console.error('❌ Keine Timeframe Buttons gefunden');
             }
@@ -7603,7 +7840,10 @@ async def get_chart():
     </script>
 </body>
 </html>
-    """)
+    """
+    if os.environ.get('CHART_DEBUG_JS') != '1':
+        html = _CONSOLE_LOG_RE.sub('', html)
+    return html.encode('utf-8')
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -7624,10 +7864,14 @@ async def websocket_endpoint(websocket: WebSocket):
 async def set_chart_data(data: dict):
     """API Endpoint um Chart-Daten zu setzen"""
 
+    # Kerzen kommen spaltenweise (Struct-of-Arrays) oder als Liste von Kerzen-Objekten
+    columns = data.get('columns')
+    candles = columns_to_candles(columns) if columns else data.get('data', [])
+
     # Update Chart State
     manager.update_chart_state({
         'type': 'set_data',
-        'data': data.get('data', []),
+        'data': candles,
         'symbol': data.get('symbol', 'NQ=F'),
         'interval': data.get('interval', '5m')
     })
@@ -7635,7 +7879,7 @@ async def set_chart_data(data: dict):
     # Broadcast an alle Clients
     await manager.broadcast({
         'type': 'set_data',
-        'data': data.get('data', []),
+        'data': candles,
         'symbol': data.get('symbol', 'NQ=F'),
         'interval': data.get('interval', '5m')
     })
@@ -7893,7 +8137,7 @@ async def change_timeframe(request: Request):
                 merged_data.extend(deduplicated_skip_candles)
 
                 # Sort by timestamp to maintain chronological order
-                merged_data.sort(key=lambda x: x['time'])
+                merged_data.sort(key=itemgetter('time'))
 
                 chart_data = merged_data
                 print(f"[BULLETPROOF-TF] Merged data: {len(chart_data)} total candles ({len(skip_candles)} skip + {len(chart_data)-len(skip_candles)} CSV)")
@@ -7918,7 +8162,8 @@ async def change_timeframe(request: Request):
 
         # CRITICAL: Add ChartDataValidator for LightweightCharts compatibility
         final_validated_data = data_validator.validate_chart_data(
-            validated_data, timeframe=target_timeframe, source=f"change_timeframe_{target_timeframe}"
+            validated_data, timeframe=target_timeframe, source=f"change_timeframe_{target_timeframe}",
+            trusted=True  # bereits von DataIntegrityGuard typisiert
         )
 
         if len(final_validated_data) != len(chart_data):
@@ -8409,8 +8654,8 @@ async def debug_set_timeframe(timeframe: str):
             target_date = unified_state.get_csv_loading_date()
             if target_date:
                 print(f"[DEBUG-SET-TF] CSV Datum-Loading: Lade 200 {timeframe} Kerzen rückwärts bis {target_date.date()}")
-            df = pd.read_csv(csv_path)
-            df['datetime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='mixed', dayfirst=True)
+            # Gecachte CSV-Daten (einmal gelesen + geparst) statt Disk-Read pro Request
+            df = debug_controller.csv_loader.load_timeframe_data(timeframe).copy()
             df['date_only'] = df['datetime'].dt.date
 
             target_date_only = target_date.date()
@@ -8426,27 +8671,19 @@ async def debug_set_timeframe(timeframe: str):
                 print(f"[DEBUG-SET-TF] Go To Date: Datum {target_date_only} nicht gefunden in {timeframe}, verwende letzte 5 Kerzen")
         else:
             print(f"[DEBUG-SET-TF] Standard: Lade 5 {timeframe} Kerzen (letzten 5)")  # ULTRA-MINI
-            df = pd.read_csv(csv_path).tail(5)
+            df = debug_controller.csv_loader.load_timeframe_data(timeframe).tail(5).copy()
 
         # Convert to chart format
         if 'datetime' not in df.columns:
             df['datetime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='mixed', dayfirst=True)
         df['time'] = df['datetime'].astype(int) // 10**9
 
-        chart_data = []
-        for _, row in df.iterrows():
-            chart_data.append({
-                'time': int(row['time']),
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close']),
-                'volume': int(row['Volume'])
-            })
+        chart_data = dataframe_to_candles(df)
 
         # CRITICAL: Validate chart data with ChartDataValidator
         validated_chart_data = data_validator.validate_chart_data(
-            chart_data, timeframe=timeframe, source=f"debug_set_timeframe_{timeframe}"
+            chart_data, timeframe=timeframe, source=f"debug_set_timeframe_{timeframe}",
+            trusted=True  # dataframe_to_candles liefert typisierte Kerzen
         )
 
         print(f"[DEBUG-SET-TF] CSV geladen: {len(chart_data)} -> {len(validated_chart_data)} {timeframe} Kerzen nach Validation")
@@ -8652,9 +8889,6 @@ async def debug_log_from_client(request: Request):
 async def debug_go_to_date(date_data: dict):
     """Ultra-High-Performance Go To Date mit Single Source of Truth"""
     try:
-        from datetime import datetime
-        import time
-
         target_date = date_data.get("date")
         if not target_date:
             return {"status": "error", "message": "Kein Datum angegeben"}
@@ -8735,11 +8969,8 @@ async def debug_go_to_date(date_data: dict):
         if not csv_path.exists():
             return {"status": "error", "message": f"CSV-Datei für {current_timeframe} nicht gefunden"}
 
-        # Lade komplette CSV und suche das gewünschte Datum
-        df = pd.read_csv(csv_path)
-
-        # DateTime kombinieren und als zusätzliche Spalte hinzufügen
-        df['datetime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='mixed', dayfirst=True)
+        # Komplette CSV aus dem CSVLoader Cache (einmal gelesen + geparst) statt Disk-Read pro Request
+        df = debug_controller.csv_loader.load_timeframe_data(current_timeframe).copy()
         df['time'] = df['datetime'].astype(int) // 10**9  # Unix timestamp für TradingView
 
         # Suche das gewünschte Datum
@@ -8761,16 +8992,7 @@ async def debug_go_to_date(date_data: dict):
             print(f"[FALLBACK-GO-TO-DATE] Datum {target_date} nicht gefunden, verwende letzten 5 Kerzen")
 
         # Konvertiere zu Chart-Format
-        chart_data = []
-        for _, row in selected_df.iterrows():
-            chart_data.append({
-                'time': int(row['time']),
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close']),
-                'volume': int(row['Volume'])
-            })
+        chart_data = dataframe_to_candles(selected_df)
 
         # UNIFIED STATE: Update Go-To-Date für alle Timeframes einheitlich (CSV-System)
         unified_state.set_go_to_date(target_datetime)
@@ -8951,7 +9173,7 @@ if __name__ == "__main__":
 <html>
 <head>
     <title>NQ Debug Chart</title>
-    <script src="https://unpkg.com/lightweight-charts@4.1.3/dist/lightweight-charts.standalone.production.js"></script>
+    <script defer src="https://unpkg.com/lightweight-charts@4.1.3/dist/lightweight-charts.standalone.production.js"></script>
     <style>
         body { margin: 0; padding: 20px; background: #f0f0f0; font-family: Arial, sans-serif; }
         h1 { text-align: center; }
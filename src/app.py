@@ -4,17 +4,20 @@ Modularisierte Version der TradingView Lightweight Charts Trading App
 Refactored mit Service Layer und Type Hints für bessere Architektur
 """
 
+import os
 import streamlit as st
 import time
 import json
 from typing import Dict, Any, Optional
 
-from config.settings import PAGE_CONFIG, APP_CSS, init_session_state, DATA_CONFIG
+from config.settings import (PAGE_CONFIG, APP_CSS, init_session_state, DATA_CONFIG,
+                             DEFAULT_SESSION_STATE, SYMBOL_OPTIONS)
 from components.sidebar import render_sidebar
 from components.trading_panel import render_trading_panel, render_debug_controls, render_debug_info
 from services.data_service import DataService
 from services.trading_service import TradingService
 from services.chart_service import get_chart_service
+from data.yahoo_finance import prewarm_yfinance_cache
 
 # Streamlit Konfiguration
 st.set_page_config(**PAGE_CONFIG)
@@ -27,8 +30,9 @@ def main() -> None:
     # Session State initialisieren
     init_session_state()
 
-    # Auto-load Standard-Asset beim ersten Start
-    _auto_load_default_asset()
+    # Optional: Sidebar-Symbole im Hintergrund vorladen (RL_TRADING_PREWARM=1)
+    if os.environ.get('RL_TRADING_PREWARM') == '1':
+        _start_cache_warming()
 
     # App-Header
     st.title("🚀 RL Trading - Clean Lightweight Charts")
@@ -37,6 +41,10 @@ def main() -> None:
     # Sidebar rendern
     sidebar_results = render_sidebar()
 
+    # Live-Daten nur bei geändertem Symbol/Intervall laden (nach der Sidebar,
+    # damit die aktuelle Auswahl bereits im Session State steht)
+    _auto_load_default_asset()
+
     # Hauptinhalt
     col1, col2 = st.columns([3, 1])
 
@@ -44,24 +52,40 @@ def main() -> None:
         # Debug-Informationen anzeigen (falls aktiv)
         render_debug_info()
 
-        # Chart-Bereich
-        _render_chart_section(sidebar_results)
+        # Chart-Bereich (als Fragment: Auto-Refresh Ticks rerunnen nur den Chart)
+        auto_refresh = st.session_state.auto_refresh and not st.session_state.debug_mode
+        chart_section = _chart_section_auto_refresh if auto_refresh else _chart_section_fragment
+        chart_section(sidebar_results)
 
         # Debug-Steuerelemente (falls Debug-Modus aktiv)
         render_debug_controls()
 
     with col2:
-        # Trading-Panel
-        render_trading_panel(_get_current_data())
+        # Trading-Panel (als Fragment: Button-Klicks rerunnen nur diese Spalte)
+        _trading_panel_fragment()
 
     # Auto-Refresh und Debug Auto-Play Logic
     _handle_auto_refresh_and_debug()
 
+@st.cache_resource(show_spinner=False)
+def _start_cache_warming() -> list:
+    """Startet das Cache-Warming der Sidebar-Symbole einmal pro Prozess (nicht pro Session)"""
+    return prewarm_yfinance_cache(SYMBOL_OPTIONS, DATA_CONFIG['default_period'],
+                                  DEFAULT_SESSION_STATE['selected_interval'])
+
+def _render_trading_column() -> None:
+    """Rendert das Trading-Panel mit den jeweils aktuellen Marktdaten"""
+    render_trading_panel(_get_current_data())
+
+# BUY/SELL/Position-Widgets lösen nur einen Rerun des Trading-Panels aus - Chart-Bereich
+# (inkl. Chart-Server Requests) und Sidebar laufen nicht erneut. Ohne Fragment-Support
+# (Streamlit < 1.37) normaler Aufruf im App-Run.
+_trading_panel_fragment = st.fragment(_render_trading_column) if hasattr(st, 'fragment') else _render_trading_column
+
 def _auto_load_default_asset() -> None:
-    """Lädt automatisch das Standard-Asset beim ersten Start über DataService"""
-    if st.session_state.live_data is None:
-        data_service = DataService()
-        data_service.auto_load_default_asset()
+    """Lädt Live-Daten über DataService - ensure_live_data lädt nur bei geändertem (Symbol, Intervall)"""
+    data_service = DataService()
+    data_service.ensure_live_data(st.session_state.selected_symbol, st.session_state.selected_interval)
 
 def _render_chart_section(sidebar_results: Dict[str, Any]) -> None:
     """
@@ -83,7 +107,9 @@ def _render_chart_section(sidebar_results: Dict[str, Any]) -> None:
     # Daten aktualisieren falls nötig über DataService
     if sidebar_results['refresh_clicked'] or sidebar_results['auto_refresh']:
         data_service = DataService()
-        data_service.refresh_data()
+        if data_service.refresh_data(force=sidebar_results['refresh_clicked']):
+            # Neue Live-Daten erneut an den Chart Server senden
+            st.session_state.pop('last_chart_key', None)
 
     # Bestimme welche Daten verwendet werden sollen
     chart_data = _determine_chart_data()
@@ -94,7 +120,7 @@ def _render_chart_section(sidebar_results: Dict[str, Any]) -> None:
 
         if st.session_state.get('last_chart_key') != chart_rebuild_key:
             # Konvertiere Daten zu TradingView Format
-            chart_data_tv = chart_service.convert_dataframe_to_chart_data(chart_data['data'])
+            chart_data_tv = chart_service.convert_market_data_to_chart_columns(chart_data)
 
             # Sende an Chart Server
             success = chart_service.set_chart_data(
@@ -153,6 +179,14 @@ def _render_chart_section(sidebar_results: Dict[str, Any]) -> None:
     else:
         st.info("Keine Daten verfügbar. Klicke auf 'Daten aktualisieren' in der Sidebar.")
 
+# Chart-Bereich als Fragment - mit Auto-Refresh tickt nur dieser Bereich im
+# auto_refresh_interval statt der ganzen App. Ohne Fragment-Support normaler Aufruf.
+if hasattr(st, 'fragment'):
+    _chart_section_fragment = st.fragment(_render_chart_section)
+    _chart_section_auto_refresh = st.fragment(run_every=DATA_CONFIG['auto_refresh_interval'])(_render_chart_section)
+else:
+    _chart_section_fragment = _chart_section_auto_refresh = _render_chart_section
+
 def _refresh_data() -> None:
     """Aktualisiert die Marktdaten über DataService (Legacy - wird durch Service ersetzt)"""
     data_service = DataService()
@@ -184,13 +218,25 @@ def _handle_auto_refresh_and_debug() -> None:
     """Behandelt Auto-Refresh und Debug Auto-Play Logic"""
     # Standard Auto-Refresh
     if st.session_state.auto_refresh and not st.session_state.debug_mode:
-        time.sleep(2)
-        st.rerun()
+        _schedule_auto_refresh()
 
     # Debug Auto-Play Logic
     if st.session_state.debug_mode and st.session_state.debug_play_mode:
         _handle_debug_auto_play()
 
+def _schedule_auto_refresh() -> None:
+    """
+    Auto-Refresh Fallback ohne Fragment-Support (Streamlit < 1.37): Sleep + voller Rerun
+
+    Mit Fragments tickt der Chart-Bereich selbst (_chart_section_auto_refresh) -
+    Sidebar, Trading-Panel und der Rest der App laufen dabei nicht erneut.
+    """
+    if hasattr(st, 'fragment'):
+        return
+
+    time.sleep(DATA_CONFIG['auto_refresh_interval'])
+    st.rerun()
+
 def _handle_debug_auto_play() -> None:
     """Behandelt Auto-Play Funktionalität im Debug-Modus mit FastAPI Integration"""
     # Berechne Delay basierend auf Geschwindigkeit
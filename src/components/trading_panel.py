@@ -5,6 +5,7 @@ Refactored für bessere Separation of Concerns
 """
 
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 from datetime import datetime
 from typing import Dict, Any, Optional
 
@@ -35,34 +36,38 @@ def render_trading_panel(data_dict: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     current_price = data_service.get_latest_price(data_dict) or 0.0
     st.metric("Aktueller Preis", f"${current_price:.2f}")
 
+    # Ein TradingService pro Render - von allen Panel-Abschnitten geteilt
+    trading_service = TradingService()
+
     # Position Management Panel
-    position_results = _render_position_panel(current_price)
+    position_results = _render_position_panel(trading_service, current_price)
 
     # Trading Buttons (Original BUY/SELL)
-    trade_results = _render_trading_buttons(current_price)
+    trade_results = _render_trading_buttons(trading_service, current_price)
 
     # Aktive Positionen anzeigen
-    _display_active_positions()
+    _display_active_positions(trading_service)
 
     # Trades anzeigen
     _display_trades()
 
     # Trade-Statistiken
-    _display_trade_statistics()
+    _display_trade_statistics(trading_service)
 
     # SL/TP Monitoring
-    _monitor_stop_loss_take_profit(current_price)
+    _monitor_stop_loss_take_profit(trading_service, current_price)
 
     # Merge results
     trade_results.update(position_results)
     return trade_results
 
-def _render_trading_buttons(current_price: float) -> Dict[str, Any]:
+def _render_trading_buttons(trading_service: TradingService, current_price: float) -> Dict[str, Any]:
     """
     Rendert BUY/SELL Buttons - UI Only
     Trading Logic delegiert an TradingService
 
     Args:
+        trading_service: TradingService des aktuellen Renders
         current_price: Aktueller Marktpreis
 
     Returns:
@@ -73,8 +78,6 @@ def _render_trading_buttons(current_price: float) -> Dict[str, Any]:
     buy_clicked = False
     sell_clicked = False
 
-    trading_service = TradingService()
-
     with col_buy:
         if st.button("🟢 BUY", key="buy_btn", use_container_width=True):
             buy_clicked = True
@@ -95,6 +98,19 @@ def _render_trading_buttons(current_price: float) -> Dict[str, Any]:
         'price': current_price
     }
 
+def _rerun_panel() -> None:
+    """
+    Rerunnt nur das Trading-Panel Fragment statt der ganzen App
+
+    Chart-Bereich (inkl. Chart-Server Requests) und Sidebar bleiben unberührt.
+    Fallback auf den vollen Rerun ohne Fragment-Support (Streamlit < 1.37) oder
+    wenn das Panel gerade im Rahmen eines vollen App-Runs rendert.
+    """
+    try:
+        st.rerun(scope="fragment")
+    except (TypeError, StreamlitAPIException):
+        st.rerun()
+
 def add_trade(trade_type: str, price: float, source: str = 'Human') -> bool:
     """
     Legacy-Funktion - Ersetzt durch TradingService.add_trade()
@@ -113,26 +129,26 @@ def add_trade(trade_type: str, price: float, source: str = 'Human') -> bool:
 
 def _display_trades() -> None:
     """Zeigt die letzten Trades an - UI Only"""
-    if not st.session_state.trades:
+    # Begrenzter Puffer der letzten Trades (neueste zuerst) - kein Slice der vollen Historie
+    recent_trades = st.session_state.get('recent_trades')
+    if not recent_trades:
         return
 
     st.subheader("🔄 Aktuelle Trades")
 
-    # Die letzten 10 Trades anzeigen
-    recent_trades = st.session_state.trades[-10:]
-
-    for trade in reversed(recent_trades):
-        timestamp = trade['timestamp'].strftime("%H:%M:%S")
-        color = "🟢" if trade['type'] == 'BUY' else "🔴"
-        source_icon = "👤" if trade['source'] == 'Human' else "🤖"
-        symbol = trade.get('symbol', 'N/A')
-
-        st.write(f"{timestamp} {color} {source_icon} {trade['type']} {symbol} @ ${trade['price']:.2f}")
-
-def _display_trade_statistics() -> None:
+    # Ein Markdown-Element für alle Zeilen statt ein st.write pro Trade
+    lines = [
+        f"{trade['timestamp'].strftime('%H:%M:%S')} "
+        f"{'🟢' if trade['action'] == 'BUY' else '🔴'} "
+        f"{'👤' if trade['source'] == 'Human' else '🤖'} "
+        f"{trade['action']} {trade.get('symbol', 'N/A')} @ \\${trade['price']:.2f}"
+        for trade in recent_trades
+    ]
+    st.markdown("  \n".join(lines))
+
+def _display_trade_statistics(trading_service: TradingService) -> None:
     """Zeigt Trade-Statistiken an - UI Only"""
     # Statistiken über TradingService laden
-    trading_service = TradingService()
     stats = trading_service.get_trading_statistics()
     if not stats:
         return
@@ -378,11 +394,12 @@ def render_debug_info():
         'current_date': current_date if 'current_date' in locals() else None
     }
 
-def _render_position_panel(current_price: float) -> Dict[str, Any]:
+def _render_position_panel(trading_service: TradingService, current_price: float) -> Dict[str, Any]:
     """
     Rendert Position Management Panel mit Long/Short und SL/TP
 
     Args:
+        trading_service: TradingService des aktuellen Renders
         current_price: Aktueller Marktpreis
 
     Returns:
@@ -390,7 +407,6 @@ def _render_position_panel(current_price: float) -> Dict[str, Any]:
     """
     st.subheader("🎯 Position Management")
 
-    trading_service = TradingService()
     results = {}
 
     # Input-Felder für Position Management
@@ -457,9 +473,8 @@ def _render_position_panel(current_price: float) -> Dict[str, Any]:
 
     return results
 
-def _display_active_positions() -> None:
+def _display_active_positions(trading_service: TradingService) -> None:
     """Zeigt aktive Positionen mit SL/TP an"""
-    trading_service = TradingService()
     active_positions = trading_service.get_active_positions()
 
     if not active_positions:
@@ -496,14 +511,13 @@ def _display_active_positions() -> None:
                     data_service = DataService()
                     current_price = data_service.get_latest_price(st.session_state.live_data) or 0.0
                     trading_service.close_position_by_id(position['id'], current_price)
-                    st.rerun()
+                    _rerun_panel()
 
-def _monitor_stop_loss_take_profit(current_price: float) -> None:
+def _monitor_stop_loss_take_profit(trading_service: TradingService, current_price: float) -> None:
     """Überwacht SL/TP Trigger automatisch"""
     if current_price <= 0:
         return
 
-    trading_service = TradingService()
     executed_orders = trading_service.check_stop_loss_take_profit(current_price)
 
     # Zeige ausgeführte Orders
@@ -512,4 +526,4 @@ def _monitor_stop_loss_take_profit(current_price: float) -> None:
 
     # Auto-Refresh bei ausgeführten Orders
     if executed_orders:
-        st.rerun()
\ No newline at end of file
+        _rerun_panel()
\ No newline at end of file
@@ -3,7 +3,9 @@ App-weite Konfigurationsdatei
 Zentrale Stelle für alle Einstellungen der RL Trading App
 """
 
+import copy
 import streamlit as st
+from collections import deque
 from datetime import datetime, timedelta, date
 
 # Page Configuration
@@ -14,18 +16,22 @@ PAGE_CONFIG = {
     "initial_sidebar_state": "expanded"
 }
 
+# Anzahl der im Trading Panel angezeigten letzten Trades
+RECENT_TRADES_LIMIT = 10
+
 # Default Values für Session State
 DEFAULT_SESSION_STATE = {
     'selected_symbol': 'NQ=F',  # NASDAQ-100 Futures als Standard
     'selected_interval': '5m',
     'live_data': None,
+    'live_data_key': None,  # (symbol, interval) der geladenen live_data
     'last_update': None,
     'trades': [],
+    'recent_trades': deque(maxlen=RECENT_TRADES_LIMIT),  # Neueste zuerst, begrenzt für die Anzeige
     'ai_trades': [],
     'human_trades': [],
     'trading_active': False,
     'auto_refresh': False,
-    'chart_id': 0,  # For forcing chart refresh
     'show_volume': True,
     'show_ma20': True,
     'show_ma50': False,
@@ -90,7 +96,11 @@ DATA_CONFIG = {
     'default_period': '5d',  # 5 Tage historische Daten
     'debug_period': '30d',   # 30 Tage für Debug-Modus
     'timezone': 'Europe/Berlin',  # UTC+2 Zeitzone
-    'default_debug_date_offset': 30  # 30 Tage zurück für Debug-Start
+    'default_debug_date_offset': 30,  # 30 Tage zurück für Debug-Start
+    'cache_ttl': 60,  # Sekunden, die yfinance Ergebnisse wiederverwendet werden
+    'quote_info_ttl': 600,  # Sekunden für ticker.info (langsam, ändert sich selten)
+    'auto_refresh_interval': 60,  # Sekunden zwischen Auto-Refresh Reruns (= cache_ttl, kürzere Ticks träfen nur den Cache)
+    'history_cache_dir': None  # Parquet-Cache für inkrementelle Downloads, z.B. '~/.rl_trading_cache' - benötigt pyarrow (None = aus)
 }
 
 # CSS Styles
@@ -150,4 +160,5 @@ def init_session_state():
     """Initialisiert den Session State mit Standard-Werten"""
     for key, value in DEFAULT_SESSION_STATE.items():
         if key not in st.session_state:
-            st.session_state[key] = value
\ No newline at end of file
+            # Eigene Kopie pro Session - Listen/Deques nicht zwischen Sessions teilen
+            st.session_state[key] = copy.copy(value)
\ No newline at end of file
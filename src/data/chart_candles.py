@@ -0,0 +1,60 @@
+"""
+Chart-Kerzen Konvertierung
+Gemeinsame spaltenweise Umwandlung von OHLC(V) DataFrames ins LightweightCharts Format
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close')
+
+
+def candle_columns(df, times: Optional[Iterable] = None, volume: bool = True) -> Dict[str, List]:
+    """
+    Extrahiert Zeit und OHLC(V) einmalig als Struct-of-Arrays ({'time': [...], 'open': [...], ...})
+
+    Args:
+        df: DataFrame mit Open/High/Low/Close und optional Volume Spalte
+        times: Zeitwerte pro Kerze - Standard: Unix Sekunden aus dem DatetimeIndex
+            (naive Zeitstempel gelten wie bei Timestamp.timestamp() als UTC)
+        volume: 'volume' Spalte aufnehmen (0 ohne Volume-Spalte im DataFrame)
+
+    Returns:
+        Dict mit einer Liste pro Chart-Spalte
+    """
+    keys = ['time'] + [column.lower() for column in PRICE_COLUMNS] + (['volume'] if volume else [])
+    if df is None or df.empty:
+        return {key: [] for key in keys}
+
+    columns = {'time': df.index.as_unit('s').asi8.tolist() if times is None else list(times)}
+    for column in PRICE_COLUMNS:
+        columns[column.lower()] = df[column].to_numpy(dtype=float).tolist()
+    if volume:
+        if 'Volume' in df.columns:
+            columns['volume'] = df['Volume'].to_numpy(dtype='int64').tolist()
+        else:
+            columns['volume'] = [0] * len(df)
+    return columns
+
+
+def candle_records(df, times: Optional[Iterable] = None, volume: bool = True,
+                   extra: Optional[Dict[str, Iterable]] = None) -> List[Dict[str, Any]]:
+    """
+    Konvertiert einen DataFrame in Kerzen-Dicts ({'time', 'open', 'high', 'low', 'close'[, 'volume']})
+
+    Spalten werden per tolist() extrahiert statt pro Zeile über iterrows() -
+    die Dicts entstehen in einem Pass über die gezippten Spalten.
+
+    Args:
+        df: DataFrame mit Open/High/Low/Close und optional Volume Spalte
+        times: Zeitwerte pro Kerze (siehe candle_columns)
+        volume: 'volume' Feld aufnehmen
+        extra: Zusätzliche Felder als Iterable pro Kerze (z.B. {'datetime': [...]})
+
+    Returns:
+        Liste von Kerzen-Dictionaries
+    """
+    columns = candle_columns(df, times=times, volume=volume)
+    if extra:
+        columns.update(extra)
+    keys = tuple(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
@@ -9,6 +9,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import glob
 
+try:
+    from .chart_candles import candle_records
+except ImportError:  # Direkter Aufruf als Skript (python src/data/...)
+    from chart_candles import candle_records
+
 class NQDataLoader:
     def __init__(self, data_path: str = "src/data/nq-1m/nq-1m"):
         self.data_path = data_path
@@ -125,24 +130,7 @@ class NQDataLoader:
 
     def convert_to_chart_format(self, df: pd.DataFrame) -> List[Dict]:
         """Konvertiert DataFrame zu LightweightCharts Format mit Unix-Timestamps"""
-        if df.empty:
-            return []
-
-        chart_data = []
-        for timestamp, row in df.iterrows():
-            # Konvertiere zu Unix-Timestamp (Sekunden seit 1970)
-            unix_timestamp = int(timestamp.timestamp())
-
-            chart_data.append({
-                'time': unix_timestamp,  # Unix-Timestamp für LightweightCharts
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close']),
-                'volume': int(row['Volume']) if 'Volume' in row else 0
-            })
-
-        return chart_data
+        return candle_records(df)
 
     def get_info(self) -> Dict:
         """Gibt Informationen über verfügbare Daten zurück"""
@@ -11,6 +11,11 @@ import json
 import os
 from functools import lru_cache
 
+try:
+    from .chart_candles import candle_records
+except ImportError:  # Direkter Aufruf als Skript (python src/data/...)
+    from chart_candles import candle_records
+
 class PerformanceAggregator:
     def __init__(self, cache_dir: str = "src/data/cache"):
         self.cache_dir = cache_dir
@@ -119,7 +124,7 @@ class PerformanceAggregator:
         data_sorted = data.sort_index()
 
         # Zeitbasierte Gruppierung mit NumPy
-        timestamps = data_sorted.index.astype(np.int64) // 10**9  # Unix seconds
+        timestamps = data_sorted.index.as_unit('s').asi8  # Unix seconds (unabhängig von der Index-Auflösung)
         interval_seconds = minutes * 60
 
         # Schnelle Gruppierung
@@ -217,9 +222,12 @@ class PerformanceAggregator:
         print(f"Generiere neue aggregierte {timeframe} Daten...")
         aggregated_df = self.create_aggregated_dataframe(base_data, timeframe)
 
-        # Speichere als CSV
+        # Speichere als CSV - in .tmp Datei schreiben und per os.replace umbenennen,
+        # damit parallele Leser (Chart Server) nie eine halbe Datei sehen
         try:
-            aggregated_df.to_csv(file_path)
+            tmp_path = f"{file_path}.tmp"
+            aggregated_df.to_csv(tmp_path)
+            os.replace(tmp_path, file_path)
             print(f"Aggregierte {timeframe} Daten gespeichert: {file_path} ({len(aggregated_df)} Kerzen)")
         except Exception as e:
             print(f"Fehler beim Speichern von {file_path}: {e}")
@@ -238,7 +246,7 @@ class PerformanceAggregator:
         data_sorted = base_data.sort_index()
 
         # Zeitbasierte Gruppierung
-        timestamps = data_sorted.index.astype(np.int64) // 10**9  # Unix seconds
+        timestamps = data_sorted.index.as_unit('s').asi8  # Unix seconds (unabhängig von der Index-Auflösung)
         interval_seconds = minutes * 60
         groups = timestamps // interval_seconds
         unique_groups = np.unique(groups)
@@ -308,24 +316,7 @@ class PerformanceAggregator:
 
     def convert_to_chart_format(self, df: pd.DataFrame) -> List[Dict]:
         """Optimierte Chart-Format Konvertierung"""
-        if df.empty:
-            return []
-
-        # NumPy-optimierte Konvertierung
-        timestamps = df.index.astype(np.int64) // 10**9  # Unix seconds
-
-        chart_data = []
-        for i, (timestamp, row) in enumerate(zip(timestamps, df.itertuples())):
-            chart_data.append({
-                'time': int(timestamp),
-                'open': float(row.Open),
-                'high': float(row.High),
-                'low': float(row.Low),
-                'close': float(row.Close),
-                'volume': int(row.Volume) if hasattr(row, 'Volume') else 0
-            })
-
-        return chart_data
+        return candle_records(df)
 
     def precompute_priority_timeframes(self, base_data: pd.DataFrame):
         """Precompute nur die wichtigsten Timeframes für Startup-Performance"""
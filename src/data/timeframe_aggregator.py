@@ -7,7 +7,87 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import json
+import logging
 import os
+import hashlib
+import threading
+import atexit
+import mmap
+import weakref
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:  # orjson ist optional - Fallback auf stdlib json
+    orjson = None
+
+try:
+    from .chart_candles import candle_records
+except ImportError:  # Direkter Aufruf als Skript (python src/data/...)
+    from chart_candles import candle_records
+
+# Geparste Cache-Dateien, instanzübergreifend: Pfad -> ((st_mtime_ns, st_size), Daten)
+# Unveränderte Dateien (gleiche mtime + Größe) werden nicht erneut geparst -
+# LRU-begrenzt, Instanzen erhalten jeweils eine eigene Kopie der Kerzenliste
+_PARSED_CACHE_FILES_LIMIT = 32
+_parsed_cache_files: 'OrderedDict[str, Tuple[Tuple[int, int], List[Dict]]]' = OrderedDict()
+_parsed_cache_lock = threading.Lock()
+
+def _get_parsed_cache_file(path: str, file_key: Tuple[int, int]) -> Optional[List[Dict]]:
+    """Kopie der geparsten Kerzen einer unveränderten Cache-Datei - None wenn unbekannt oder geändert"""
+    with _parsed_cache_lock:
+        parsed = _parsed_cache_files.get(path)
+        if parsed is None or parsed[0] != file_key:
+            return None
+        _parsed_cache_files.move_to_end(path)
+        return list(parsed[1])
+
+def _remember_parsed_cache_file(path: str, file_key: Tuple[int, int], data: List[Dict]):
+    """Merkt sich die geparsten Kerzen einer Cache-Datei (älteste Einträge fallen heraus)"""
+    with _parsed_cache_lock:
+        _parsed_cache_files[path] = (file_key, list(data))
+        _parsed_cache_files.move_to_end(path)
+        while len(_parsed_cache_files) > _PARSED_CACHE_FILES_LIMIT:
+            _parsed_cache_files.popitem(last=False)
+
+def _forget_parsed_cache_file(path: str):
+    """Entfernt eine gelöschte Cache-Datei aus dem Parse-Cache"""
+    with _parsed_cache_lock:
+        _parsed_cache_files.pop(path, None)
+
+def _file_stat_key(path: str) -> Tuple[int, int]:
+    """stat()-basierter Versionsschlüssel einer Datei"""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+# Ab dieser Dateigröße wird per mmap gelesen (darunter dominiert der mmap Setup-Aufwand)
+_MMAP_THRESHOLD = 64 * 1024
+
+def _read_cache_file(path: str) -> List[Dict]:
+    """
+    Liest eine JSON Cache-Datei - mit orjson große Dateien zero-copy via mmap,
+    kleine Dateien per einfachem read(); ohne orjson über stdlib json
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if orjson is not None and size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+        payload = f.read()
+
+    return orjson.loads(payload) if orjson is not None else json.loads(payload)
+
+# Lebende Aggregatoren - beim Prozessende einmalig gemeinsam geflusht. WeakSet statt
+# atexit.register pro Instanz: hält keine Instanz bis zum Exit am Leben
+_live_aggregators: "weakref.WeakSet[TimeframeAggregator]" = weakref.WeakSet()
+
+def _flush_all_aggregators():
+    """Schreibt die gepufferten Saves aller noch lebenden Aggregatoren (atexit)"""
+    for aggregator in list(_live_aggregators):
+        aggregator.flush_cache()
+
+atexit.register(_flush_all_aggregators)
 
 class TimeframeAggregator:
     def __init__(self, cache_dir: str = "src/data/cache"):
@@ -29,6 +109,16 @@ class TimeframeAggregator:
         # In-Memory Cache für aggregierte Daten
         self.memory_cache = {}
 
+        # Hash des zuletzt geschriebenen Payloads pro Cache-Datei (unveränderte Saves überspringen)
+        self._file_hashes = {}
+
+        # Write-Behind Puffer: verzögerte Saves werden gesammelt und gebündelt geschrieben
+        self.write_behind_delay = 0.5  # Sekunden
+        self._pending_writes = {}
+        self._flush_timer = None
+        self._write_lock = threading.Lock()
+        _live_aggregators.add(self)
+
         print(f"TimeframeAggregator initialisiert - Cache: {cache_dir}")
 
     def get_cache_key(self, timeframe: str, start_date: str, end_date: str) -> str:
@@ -43,38 +133,101 @@ class TimeframeAggregator:
         """Lädt aggregierte Daten aus dem Cache"""
         # Prüfe In-Memory Cache zuerst
         if cache_key in self.memory_cache:
-            print(f"Memory Cache Hit für {cache_key}")
+            logging.debug("Memory Cache Hit für %s", cache_key)
             return self.memory_cache[cache_key]
 
         # Prüfe File Cache
         cache_file = self.get_cache_filename(cache_key)
         if os.path.exists(cache_file):
             try:
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
+                file_key = _file_stat_key(cache_file)
+                data = _get_parsed_cache_file(cache_file, file_key)
+                if data is None:
+                    data = _read_cache_file(cache_file)
+                    _remember_parsed_cache_file(cache_file, file_key, data)
                 # Lade in Memory Cache
                 self.memory_cache[cache_key] = data
-                print(f"File Cache Hit für {cache_key} - {len(data)} Kerzen")
+                logging.debug("File Cache Hit für %s - %d Kerzen", cache_key, len(data))
                 return data
             except Exception as e:
                 print(f"Fehler beim Laden aus Cache {cache_file}: {e}")
 
         return None
 
-    def save_to_cache(self, cache_key: str, data: List[Dict]):
-        """Speichert aggregierte Daten im Cache"""
+    def save_to_cache(self, cache_key: str, data: List[Dict], flush: bool = True):
+        """
+        Speichert aggregierte Daten im Cache
+
+        Args:
+            cache_key: Cache-Key der Daten
+            data: Kerzen im Chart-Format
+            flush: True schreibt sofort auf Disk, False puffert den Save und schreibt
+                   nach write_behind_delay gebündelt (mehrere Saves -> ein Write)
+        """
         # Speichere in Memory Cache
         self.memory_cache[cache_key] = data
 
-        # Speichere in File Cache
+        if not flush:
+            with self._write_lock:
+                self._pending_writes[cache_key] = data
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                self._flush_timer = threading.Timer(self.write_behind_delay, self.flush_cache)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+            return
+
+        with self._write_lock:
+            self._pending_writes.pop(cache_key, None)
+            self._persist(cache_key, data)
+
+    def flush_cache(self):
+        """Schreibt alle gepufferten Saves sofort auf Disk"""
+        with self._write_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+            pending, self._pending_writes = self._pending_writes, {}
+            for cache_key, data in pending.items():
+                self._persist(cache_key, data)
+
+    def _persist(self, cache_key: str, data: List[Dict]):
+        """Schreibt einen Cache-Eintrag in den File Cache (Aufrufer hält _write_lock)"""
         cache_file = self.get_cache_filename(cache_key)
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(data, f)
-            print(f"Cache gespeichert: {cache_key} - {len(data)} Kerzen")
+            if self._write_cache_file(cache_file, data):
+                print(f"Cache gespeichert: {cache_key} - {len(data)} Kerzen")
         except Exception as e:
             print(f"Fehler beim Speichern in Cache {cache_file}: {e}")
 
+    def _write_cache_file(self, cache_file: str, data: List[Dict]) -> bool:
+        """
+        Schreibt Cache-Daten atomar: komplette Serialisierung im Speicher,
+        ein einziger write() in eine .tmp Datei, danach os.replace.
+        Leser sehen so nie eine halb geschriebene JSON-Datei.
+
+        Returns:
+            False wenn der Payload identisch zur zuletzt geschriebenen Datei war (kein I/O)
+        """
+        if orjson is not None:
+            payload = orjson.dumps(data)
+        else:
+            payload = json.dumps(data).encode('utf-8')
+
+        payload_hash = hashlib.blake2b(payload, digest_size=16).digest()
+        if self._file_hashes.get(cache_file) == payload_hash and os.path.exists(cache_file):
+            return False
+
+        tmp_file = f"{cache_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_file, cache_file)
+
+        self._file_hashes[cache_file] = payload_hash
+        _remember_parsed_cache_file(cache_file, _file_stat_key(cache_file), data)
+        return True
+
     def aggregate_timeframe(self, base_data: pd.DataFrame, target_timeframe: str) -> pd.DataFrame:
         """Aggregiert 1m-Daten zu einem höheren Timeframe"""
         if target_timeframe not in self.timeframe_minutes:
@@ -115,7 +268,7 @@ class TimeframeAggregator:
         print(f"Aggregiert: {len(base_data)} -> {len(aggregated)} Kerzen ({target_timeframe})")
         return aggregated
 
-    def get_aggregated_data(self, base_data: pd.DataFrame, timeframe: str) -> List[Dict]:
+    def get_aggregated_data(self, base_data: pd.DataFrame, timeframe: str, flush: bool = True) -> List[Dict]:
         """Holt aggregierte Daten mit intelligentem Caching"""
         if timeframe == '1m':
             # Keine Aggregation nötig - konvertiere direkt zu Chart-Format
@@ -136,30 +289,13 @@ class TimeframeAggregator:
         chart_data = self.convert_to_chart_format(aggregated_df)
 
         # Speichere im Cache
-        self.save_to_cache(cache_key, chart_data)
+        self.save_to_cache(cache_key, chart_data, flush=flush)
 
         return chart_data
 
     def convert_to_chart_format(self, df: pd.DataFrame) -> List[Dict]:
         """Konvertiert DataFrame zu LightweightCharts Format mit Unix-Timestamps"""
-        if df.empty:
-            return []
-
-        chart_data = []
-        for timestamp, row in df.iterrows():
-            # Konvertiere zu Unix-Timestamp (Sekunden seit 1970)
-            unix_timestamp = int(timestamp.timestamp())
-
-            chart_data.append({
-                'time': unix_timestamp,  # Unix-Timestamp für LightweightCharts
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close']),
-                'volume': int(row['Volume']) if 'Volume' in row else 0
-            })
-
-        return chart_data
+        return candle_records(df)
 
     def precompute_all_timeframes(self, base_data: pd.DataFrame):
         """Berechnet alle Timeframes vor und speichert sie im Cache"""
@@ -173,14 +309,22 @@ class TimeframeAggregator:
                 continue  # Skip 1m da es die Basis-Daten sind
 
             print(f"Precomputing {timeframe}...")
-            self.get_aggregated_data(base_data, timeframe)
+            self.get_aggregated_data(base_data, timeframe, flush=False)
 
+        # Gepufferte Cache-Dateien gebündelt schreiben
+        self.flush_cache()
         print("Alle Timeframes precomputed")
 
     def clear_cache(self):
         """Löscht den gesamten Cache"""
-        # Leere Memory Cache
+        # Leere Memory Cache und verwerfe gepufferte Saves
+        with self._write_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._pending_writes.clear()
         self.memory_cache.clear()
+        self._file_hashes.clear()
 
         # Lösche File Cache
         if os.path.exists(self.cache_dir):
@@ -189,6 +333,7 @@ class TimeframeAggregator:
                     file_path = os.path.join(self.cache_dir, filename)
                     try:
                         os.remove(file_path)
+                        _forget_parsed_cache_file(file_path)
                         print(f"Cache-Datei geloescht: {filename}")
                     except Exception as e:
                         print(f"Fehler beim Loeschen von {filename}: {e}")
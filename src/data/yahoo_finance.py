@@ -4,12 +4,29 @@ Zentrale Schnittstelle für das Laden von Marktdaten über yfinance
 """
 
 import yfinance as yf
+import numpy as np
 import pandas as pd
 import pytz
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 import streamlit as st
 from config.settings import DATA_CONFIG
 
+OHLC_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# yf.Ticker Instanzen pro Symbol wiederverwenden (teilen Session/Cookies/Crumb)
+_TICKERS = {}
+
+def _get_ticker(symbol):
+    """Liefert die gemerkte yf.Ticker Instanz für ein Symbol"""
+    ticker = _TICKERS.get(symbol)
+    if ticker is None:
+        ticker = _TICKERS[symbol] = yf.Ticker(symbol)
+    return ticker
+
 def _make_timezone_compatible(start_datetime, df_index):
     """
     Macht start_datetime kompatibel mit dem DataFrame Index für Vergleiche
@@ -31,47 +48,267 @@ def _make_timezone_compatible(start_datetime, df_index):
         # Beide haben gleiche Timezone-Situation
         return start_datetime
 
-def get_yfinance_data(symbol, period="1d", interval="5m"):
+def get_yfinance_data(symbol, period="1d", interval="5m", with_quote=False):
     """
     Lädt Live-Daten von Yahoo Finance mit automatischer Zeitzone-Konvertierung
 
+    Der eigentliche Download ist über st.cache_data gecacht - identische
+    (symbol, period, interval) Abfragen innerhalb der TTL lösen keinen
+    erneuten HTTP-Request aus. Fehler werden nicht gecacht, sondern hier
+    angezeigt - der nächste Aufruf versucht den Download erneut.
+
     Args:
         symbol (str): Trading Symbol (z.B. "NQ=F", "AAPL")
         period (str): Zeitraum ("1d", "5d", "30d", "1y")
         interval (str): Intervall ("1m", "5m", "15m", "1h", "1d")
+        with_quote (bool): current_price aus dem Live-Quote (ticker.fast_info)
+            statt aus dem letzten Close - zusätzlicher, schlanker HTTP-Request
 
     Returns:
-        dict: Daten-Dictionary mit 'data', 'current_price', 'symbol', 'last_update', 'info'
+        dict: Daten-Dictionary mit 'data', 'current_price', 'symbol', 'last_update'
         None: Bei Fehlern
+
+    Hinweis: Ticker-Stammdaten (ticker.info) werden nicht mehr mitgeladen -
+    bei Bedarf separat über get_quote_info() abrufen.
     """
     try:
-        ticker = yf.Ticker(symbol)
+        data_dict = _fetch_yfinance_data(symbol, period, interval)
+    except LookupError as e:
+        st.error(str(e))
+        return None
+    except Exception as e:
+        st.error(f"Fehler beim Laden von {symbol}: {e}")
+        return None
+
+    if with_quote:
+        last_price = get_last_price(symbol)
+        if last_price is not None:
+            data_dict['current_price'] = last_price
+
+    return data_dict
+
+@st.cache_data(ttl=DATA_CONFIG['cache_ttl'], show_spinner=False)
+def _fetch_yfinance_data(symbol, period, interval):
+    """
+    Seiteneffektfreier (cachebarer) yfinance Download
+
+    Fehler werden geworfen statt zurückgegeben - st.cache_data cacht keine
+    Exceptions, ein einmaliger Netzwerkfehler blockiert so nicht die ganze TTL.
+
+    Args:
+        symbol (str): Trading Symbol
+        period (str): Zeitraum
+        interval (str): Intervall
+
+    Returns:
+        dict: Daten-Dictionary
+
+    Raises:
+        LookupError: Keine Daten für das Symbol
+    """
+    ticker = _get_ticker(symbol)
+    hist = _load_history(ticker, symbol, period, interval)
+
+    if hist.empty:
+        raise LookupError(f"Keine Daten für Symbol {symbol} verfügbar")
+
+    # Timezone handling für TradingView - UTC+2 (Europa/Berlin)
+    hist = _convert_timezone(hist, DATA_CONFIG['timezone'])
+
+    # OHLC einmalig als float64 Spalten fixieren - Konsumenten lesen
+    # die Spalten per to_numpy() ohne weitere float() Casts pro Zeile.
+    # Kein round(2) mehr (volle DataFrame-Kopie) - Chart und UI formatieren
+    # Preise selbst auf 2 Nachkommastellen
+    hist = hist.astype({column: 'float64' for column in OHLC_COLUMNS})
+
+    # OHLCV einmal pro Download als NumPy Spalten (SoA) - Chart und Preis-Anzeige
+    # lesen diese statt bei jedem Rerun erneut aus dem DataFrame zu extrahieren
+    arrays = ohlcv_arrays(hist)
+
+    # Aktueller Preis = letzter Close (spart den teuren ticker.info Request)
+    current_price = float(arrays['close'][-1])
+
+    return {
+        'data': hist,
+        'arrays': arrays,
+        'current_price': current_price,
+        'symbol': symbol,
+        'last_update': datetime.now(),
+    }
+
+def clear_yfinance_cache():
+    """Verwirft gecachte yfinance Downloads - der nächste Abruf lädt frisch (expliziter Refresh)"""
+    _fetch_yfinance_data.clear()
+
+def prewarm_yfinance_cache(symbols, period, interval, max_workers=5):
+    """
+    Lädt mehrere Symbole parallel im Hintergrund in den yfinance Cache (Cache-Warming)
+
+    Ruft den gecachten _fetch_yfinance_data direkt auf - spätere Symbolwechsel
+    auf eines der Symbole treffen innerhalb der TTL den Cache statt Yahoo.
+
+    Args:
+        symbols (list): Zu ladende Trading Symbole
+        period (str): Zeitraum
+        interval (str): Intervall
+        max_workers (int): Parallele Downloads
+
+    Returns:
+        list: Futures der Downloads (blockiert nicht)
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='yf-prewarm')
+    futures = [executor.submit(_fetch_yfinance_data, symbol, period, interval) for symbol in symbols]
+    executor.shutdown(wait=False)
+    return futures
+
+def ohlcv_arrays(df):
+    """
+    Extrahiert OHLCV einmalig als Struct-of-Arrays
+
+    Args:
+        df (DataFrame): OHLCV Daten mit DatetimeIndex
+
+    Returns:
+        dict: 'time' (Unix Sekunden, int64), 'open'/'high'/'low'/'close' (float64), 'volume'
+    """
+    arrays = {'time': df.index.as_unit('s').asi8}
+    for column in OHLC_COLUMNS:
+        arrays[column.lower()] = df[column].to_numpy(dtype='float64')
+    arrays['volume'] = df['Volume'].to_numpy() if 'Volume' in df.columns else np.zeros(len(df))
+    return arrays
+
+# Wie weit Yahoo Intraday-Daten zurück liefert - ältere Cache-Stände lassen sich
+# nicht per Delta fortschreiben (1m zusätzlich max. ~8 Tage pro Request)
+_DELTA_LOOKBACK_LIMITS = {
+    '1m': pd.Timedelta(days=7),
+    '2m': pd.Timedelta(days=59),
+    '5m': pd.Timedelta(days=59),
+    '15m': pd.Timedelta(days=59),
+    '30m': pd.Timedelta(days=59),
+    '90m': pd.Timedelta(days=59),
+    '60m': pd.Timedelta(days=729),
+    '1h': pd.Timedelta(days=729),
+}
+
+def _history_cache_path(symbol, period, interval):
+    """Parquet-Datei im History-Cache für (symbol, period, interval) - None wenn deaktiviert"""
+    cache_dir = DATA_CONFIG.get('history_cache_dir')
+    if not cache_dir:
+        return None
+    safe_symbol = re.sub(r'[^A-Za-z0-9_.-]', '_', symbol)
+    return Path(cache_dir).expanduser() / f"{safe_symbol}_{period}_{interval}.parquet"
+
+def _load_history(ticker, symbol, period, interval):
+    """
+    Lädt die Kurshistorie inkrementell über einen Parquet-Cache
+
+    Ist bereits eine Historie auf Disk, wird nur das Delta ab der letzten
+    gespeicherten Kerze nachgeladen (die letzte Kerze wird dabei aktualisiert)
+    und an die Historie angehängt. Fehler im Cache (z.B. fehlendes pyarrow),
+    ein veralteter Cache (außerhalb von period bzw. Yahoos Intraday-Fenster)
+    oder ein leeres Delta fallen auf den vollständigen Download zurück.
+
+    Args:
+        ticker: yf.Ticker Instanz
+        symbol (str): Trading Symbol
+        period (str): Zeitraum
+        interval (str): Intervall
+
+    Returns:
+        DataFrame: Rohe yfinance Historie (Börsen-Zeitzone, ungerundet)
+    """
+    cache_path = _history_cache_path(symbol, period, interval)
+    cached = None
+    if cache_path is not None and cache_path.exists():
+        try:
+            cached = pd.read_parquet(cache_path)
+        except Exception as e:
+            print(f"[HISTORY-CACHE] Cache für {symbol} nicht lesbar: {e}")
+
+    delta = None
+    if cached is not None and not cached.empty and not _is_cache_stale(cached.index.max(), period, interval):
+        delta = ticker.history(start=cached.index.max(), interval=interval)
+
+    if delta is None or delta.empty:
         hist = ticker.history(period=period, interval=interval)
+    else:
+        hist = pd.concat([cached, delta])
+        hist = hist[~hist.index.duplicated(keep='last')].sort_index()
+        hist = _trim_to_period(hist, period)
+
+    if cache_path is not None and not hist.empty:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            hist.to_parquet(tmp_path)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"[HISTORY-CACHE] Cache für {symbol} nicht schreibbar: {e}")
 
-        if hist.empty:
-            st.error(f"Keine Daten für Symbol {symbol} verfügbar")
-            return None
+    return hist
 
-        # Timezone handling für TradingView - UTC+2 (Europa/Berlin)
-        hist = _convert_timezone(hist, DATA_CONFIG['timezone'])
+def _is_cache_stale(last_timestamp, period, interval):
+    """
+    True wenn die letzte gecachte Kerze zu alt für einen Delta-Download ist
 
-        # Runde Preise auf 2 Dezimalstellen
-        hist = hist.round(2)
+    Älter als period ("Nd" = N Kalendertage) oder außerhalb des Fensters, für das
+    Yahoo das Intervall überhaupt liefert - das Delta käme dann leer zurück.
+    """
+    age = pd.Timestamp.now(tz=last_timestamp.tz) - last_timestamp
+    limit = _DELTA_LOOKBACK_LIMITS.get(interval)
+    if limit is not None and age > limit:
+        return True
+    match = re.fullmatch(r'(\d+)d', period)
+    return bool(match) and age > pd.Timedelta(days=int(match.group(1)))
+
+def _trim_to_period(hist, period):
+    """
+    Begrenzt eine fortgeschriebene Historie auf period
 
-        # Hole zusätzliche Ticker-Informationen
-        info = ticker.info
-        current_price = info.get('currentPrice', hist['Close'].iloc[-1])
+    "Nd" entspricht wie bei yfinance den letzten N Handelstagen - andere
+    Perioden ("1mo", "1y", "max") werden nicht beschnitten.
+    """
+    match = re.fullmatch(r'(\d+)d', period)
+    if not match:
+        return hist
+    dates = hist.index.normalize()
+    trading_days = dates.unique()
+    days = int(match.group(1))
+    if len(trading_days) <= days:
+        return hist
+    return hist[dates >= trading_days[-days]]
+
+@st.cache_data(ttl=DATA_CONFIG['quote_info_ttl'], show_spinner=False)
+def get_quote_info(symbol):
+    """
+    Lädt Ticker-Stammdaten (ticker.info) lazy - nur wenn sie wirklich angezeigt werden
 
-        return {
-            'data': hist,
-            'current_price': current_price,
-            'symbol': symbol,
-            'last_update': datetime.now(),
-            'info': info
-        }
+    Args:
+        symbol (str): Trading Symbol
 
-    except Exception as e:
-        st.error(f"Fehler beim Laden von {symbol}: {e}")
+    Returns:
+        dict: Ticker-Informationen (leer bei Fehlern)
+    """
+    try:
+        return _get_ticker(symbol).info
+    except Exception:
+        return {}
+
+@st.cache_data(ttl=DATA_CONFIG['cache_ttl'], show_spinner=False)
+def get_last_price(symbol):
+    """
+    Lädt den letzten Kurs über ticker.fast_info (schlanker Endpoint statt ticker.info)
+
+    Args:
+        symbol (str): Trading Symbol
+
+    Returns:
+        float: Letzter Kurs oder None bei Fehlern
+    """
+    try:
+        last_price = _get_ticker(symbol).fast_info.last_price
+        return float(last_price) if last_price is not None else None
+    except Exception:
         return None
 
 def _convert_timezone(hist, target_timezone):
@@ -111,7 +348,8 @@ def filter_debug_data(data_dict, debug_start_date, current_index):
     if not data_dict or data_dict['data'].empty:
         return None
 
-    df = data_dict['data'].copy()
+    # Nur gelesen und per iloc geschnitten - keine Kopie des vollen Frames nötig
+    df = data_dict['data']
 
     # Konvertiere debug_start_date zu datetime falls nötig
     if hasattr(debug_start_date, 'date'):
@@ -143,16 +381,23 @@ def filter_debug_data(data_dict, debug_start_date, current_index):
         # Falls über die verfügbaren Daten hinaus, nimm alle
         df_filtered = df
 
+    # Letzter Close einmal als Skalar (Spalten-Array statt pandas .iloc)
+    closes = data_dict['arrays']['close'] if 'arrays' in data_dict else df['Close'].to_numpy()
+    # df_filtered ist nie leer: start_index < len(df) und absolute_index >= start_index
+    row_count = len(df_filtered)
+
     # Erstelle neues data_dict mit gefilterten Daten
     filtered_data = {
         'data': df_filtered,
-        'current_price': df_filtered['Close'].iloc[-1] if not df_filtered.empty else 0,
+        'current_price': float(closes[row_count - 1]),
         'symbol': data_dict['symbol'],
         'last_update': data_dict['last_update'],
-        'info': data_dict['info'],
         'debug_start_index': start_index,  # Zusätzliche Info für Chart-Positionierung
-        'debug_current_timestamp': df_filtered.index[-1] if not df_filtered.empty else None
+        'debug_current_timestamp': df_filtered.index[-1]
     }
+    if 'arrays' in data_dict:
+        # Präfix-Views der vorberechneten Spalten statt neuer Extraktion
+        filtered_data['arrays'] = {key: values[:row_count] for key, values in data_dict['arrays'].items()}
 
     return filtered_data
 
@@ -12,6 +12,7 @@ from typing import Dict, List, Callable, Optional
 import threading
 import time
 from datetime import datetime, timedelta
+from operator import attrgetter
 import ccxt
 import queue
 import logging
@@ -311,7 +312,7 @@ class BinanceDataFeed:
         ]
 
         # Sort by timestamp
-        filtered_data.sort(key=lambda x: x.timestamp)
+        filtered_data.sort(key=attrgetter('timestamp'))
 
         # Take last N records
         filtered_data = filtered_data[-limit:] if len(filtered_data) > limit else filtered_data
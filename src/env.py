@@ -12,6 +12,15 @@ import hashlib
 
 from rewards import RewardManager, PnLReward, FVGReward, OrderBlockReward, LiquidityZoneReward, HumanFeedbackReward, RiskManagementReward
 from patterns import PatternManager, FVGDetector, OrderBlockDetector, LiquidityZoneDetector, MarketStructureDetector
+from performance.indicators import rsi_last, macd_signal_last, rolling_mean_std
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Gleitender Mittelwert via Cumsum in O(N) - out[k] = mean(values[k:k+window])
+    """
+    cs = np.cumsum(np.insert(values.astype(np.float64), 0, 0.0))
+    return (cs[window:] - cs[:-window]) / window
 
 
 class InteractiveTradingEnv(gym.Env):
@@ -35,6 +44,14 @@ class InteractiveTradingEnv(gym.Env):
         self.max_position_size = max_position_size
         self.enable_patterns = enable_patterns
 
+        # Indikatoren einmalig vorberechnen statt pro Step über den ganzen DataFrame
+        self._close = self.df['close'].to_numpy(dtype=np.float64)
+        returns = self.df['close'].pct_change().to_numpy()
+        self._returns_mean5, _ = rolling_mean_std(returns, 5)
+        _, self._returns_std20 = rolling_mean_std(returns, 20)
+        self._close_ma20 = _rolling_mean(self._close, 20)
+        self._volume_ma20 = _rolling_mean(self.df['volume'].to_numpy(), 20)
+
         # Spaces
         self.observation_space = spaces.Box(
             low=-np.inf, high=np.inf,
@@ -145,16 +162,15 @@ class InteractiveTradingEnv(gym.Env):
             current['open'] / current['close'] - 1,
             current['high'] / current['close'] - 1,
             current['low'] / current['close'] - 1,
-            (current['volume'] / self.df['volume'].rolling(20).mean().iloc[idx] - 1) if idx >= 19 else 0
+            (current['volume'] / self._volume_ma20[idx - 19] - 1) if idx >= 19 else 0
         ]
 
         # Technical Features
-        returns = self.df['close'].pct_change()
         if idx >= 20:
             technical_features = [
-                returns.iloc[idx-5:idx].mean(),  # 5-period return
-                returns.iloc[idx-20:idx].std(),  # 20-period volatility
-                (current['close'] / self.df['close'].iloc[idx-20:idx].mean() - 1),  # Price momentum
+                self._returns_mean5[idx - 5],  # 5-period return
+                self._returns_std20[idx - 20],  # 20-period volatility
+                (current['close'] / self._close_ma20[idx - 20] - 1),  # Price momentum
                 self._calculate_rsi(idx),
                 self._calculate_macd_signal(idx)
             ]
@@ -256,12 +272,15 @@ class InteractiveTradingEnv(gym.Env):
         # Update action history
         self.action_history.append(action)
 
+        # Observation einmal pro Step berechnen (State Hash, Rewards und Rückgabe nutzen dieselbe)
+        observation = self._get_observation()
+
         # Prepare environment info for rewards
-        env_info = self._prepare_env_info(pnl_change, trade_info, new_price)
+        env_info = self._prepare_env_info(pnl_change, trade_info, new_price, observation)
 
         # Calculate modular rewards
         total_reward, reward_breakdown = self.reward_manager.calculate_total_reward(
-            self._get_observation(), action, env_info
+            observation, action, env_info
         )
 
         # Prepare info dict
@@ -279,7 +298,7 @@ class InteractiveTradingEnv(gym.Env):
             'pnl_change': pnl_change
         }
 
-        return self._get_observation(), total_reward, done, False, info
+        return observation, total_reward, done, False, info
 
     def _execute_trade(self, action: int, price: float) -> Dict:
         """Execute trading action with realistic constraints"""
@@ -373,11 +392,12 @@ class InteractiveTradingEnv(gym.Env):
 
         return trade_info
 
-    def _prepare_env_info(self, pnl_change: float, trade_info: Dict, current_price: float) -> Dict:
+    def _prepare_env_info(self, pnl_change: float, trade_info: Dict, current_price: float,
+                          observation: Optional[np.ndarray] = None) -> Dict:
         """Prepare environment info for reward calculation"""
         env_info = {
             'pnl_change': pnl_change / self.initial_cash,  # Normalized
-            'state_hash': self._get_state_hash(),
+            'state_hash': self._get_state_hash(observation),
             'trade_info': trade_info,
             'portfolio_risk': self._calculate_portfolio_risk(),
             'stop_loss_active': False,  # TODO: Implement stop loss
@@ -392,9 +412,10 @@ class InteractiveTradingEnv(gym.Env):
 
         return env_info
 
-    def _get_state_hash(self) -> str:
+    def _get_state_hash(self, obs: Optional[np.ndarray] = None) -> str:
         """Generate hash for current state (for human feedback)"""
-        obs = self._get_observation()
+        if obs is None:
+            obs = self._get_observation()
         # Use only the most relevant features for hashing
         key_features = obs[:10]  # Price and technical features
         hash_input = ','.join([f'{x:.3f}' for x in key_features])
@@ -405,32 +426,15 @@ class InteractiveTradingEnv(gym.Env):
         if idx < period:
             return 0.5  # Neutral RSI
 
-        price_changes = self.df['close'].iloc[idx-period:idx+1].pct_change()
-        gains = price_changes.where(price_changes > 0, 0)
-        losses = -price_changes.where(price_changes < 0, 0)
-
-        avg_gain = gains.mean()
-        avg_loss = losses.mean()
-
-        if avg_loss == 0:
-            return 1.0
-
-        rs = avg_gain / avg_loss
-        rsi = 1 - (1 / (1 + rs))
-        return rsi
+        return rsi_last(self._close, idx, period)
 
     def _calculate_macd_signal(self, idx: int) -> float:
         """Calculate MACD signal"""
         if idx < 26:
             return 0.0
 
-        prices = self.df['close'].iloc[max(0, idx-50):idx+1]
-        ema12 = prices.ewm(span=12).mean().iloc[-1]
-        ema26 = prices.ewm(span=26).mean().iloc[-1]
-        macd = ema12 - ema26
-
-        # Normalize to [-1, 1] range
-        return np.tanh(macd / prices.iloc[-1] * 100)
+        # EMA12 - EMA26 über die letzten 50 Kerzen, normalisiert auf [-1, 1]
+        return macd_signal_last(self._close, idx)
 
     def _calculate_portfolio_risk(self) -> float:
         """Calculate current portfolio risk"""
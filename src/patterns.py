@@ -154,7 +154,7 @@ class OrderBlockDetector(PatternDetector):
             return False, None
 
         recent_data = df.iloc[current_idx - self.lookback:current_idx + 1]
-        current_price = df.iloc[current_idx]['close']
+        current_price = df['close'].iat[current_idx]
 
         # Finde potenzielle Order Blocks
         ob_found = False
@@ -264,14 +264,12 @@ class LiquidityZoneDetector(PatternDetector):
         num_bins = 20
 
         price_bins = np.linspace(price_min, price_max, num_bins)
-        volume_profile = np.zeros(num_bins - 1)
 
-        for idx, row in recent_data.iterrows():
-            # Finde Bin für diese Kerze
-            mid_price = (row['high'] + row['low']) / 2
-            bin_idx = np.digitize(mid_price, price_bins) - 1
-            bin_idx = max(0, min(bin_idx, len(volume_profile) - 1))
-            volume_profile[bin_idx] += row['volume']
+        # Bin pro Kerze (Mittelpreis) und Volume-Summe je Bin spaltenweise statt iterrows()
+        mid_prices = (recent_data['high'].to_numpy() + recent_data['low'].to_numpy()) / 2
+        bin_indices = np.clip(np.digitize(mid_prices, price_bins) - 1, 0, num_bins - 2)
+        volume_profile = np.bincount(bin_indices, weights=recent_data['volume'].to_numpy(dtype=np.float64),
+                                     minlength=num_bins - 1)
 
         # Finde High Volume Nodes (HVN)
         mean_volume = volume_profile.mean()
@@ -284,7 +282,7 @@ class LiquidityZoneDetector(PatternDetector):
             zone_volume = volume_profile[strongest_idx]
 
             # Bestimme Richtung zum Zone
-            current_price = df.iloc[current_idx]['close']
+            current_price = df['close'].iat[current_idx]
             direction = 1 if zone_price > current_price else -1
 
             liquidity_info = PatternInfo(
@@ -345,7 +343,7 @@ class MarketStructureDetector(PatternDetector):
             structure_info = PatternInfo(
                 pattern_type="MarketStructure",
                 confidence=0.7,  # Basis Confidence
-                price_level=df.iloc[current_idx]['close'],
+                price_level=df['close'].iat[current_idx],
                 direction=structure,
                 strength=1.0,
                 metadata={
@@ -427,7 +425,7 @@ class PatternManager:
         self.pattern_history.append({
             'idx': current_idx,
             'patterns': detected_patterns,
-            'price': df.iloc[current_idx]['close']
+            'price': df['close'].iat[current_idx]
         })
 
         return detected_patterns
@@ -436,7 +434,7 @@ class PatternManager:
         """
         Generiert Trading Signals basierend auf allen Patterns
         """
-        current_price = df.iloc[current_idx]['close']
+        current_price = df['close'].iat[current_idx]
         signals = {
             'in_fvg_zone': False,
             'fvg_distance': float('inf'),
@@ -0,0 +1,107 @@
+"""
+Candle Aggregation Kernel
+=========================
+OHLCV-Aggregation von 1m Kerzen zu höheren Timeframes auf reinen NumPy Arrays.
+Mit installiertem Numba läuft die Reduktion als JIT-kompilierte Schleife in einem
+einzigen Pass, ohne Numba als vektorisierter NumPy reduceat-Fallback.
+"""
+
+import numpy as np
+from typing import Tuple
+
+try:
+    from numba import njit
+except ImportError:  # Numba ist optional - Fallback auf NumPy
+    njit = None
+
+
+def _aggregate_loop(times, opens, highs, lows, closes, volumes, factor):
+    """Single-Pass OHLCV Reduktion - wird bei verfügbarem Numba JIT-kompiliert"""
+    n = len(times)
+    out_time = np.empty(n, dtype=np.int64)
+    out_open = np.empty(n, dtype=np.float64)
+    out_high = np.empty(n, dtype=np.float64)
+    out_low = np.empty(n, dtype=np.float64)
+    out_close = np.empty(n, dtype=np.float64)
+    out_volume = np.empty(n, dtype=np.int64)
+
+    period = factor * 60
+    count = 0
+    i = 0
+    while i < n:
+        bucket = (times[i] - times[0]) // period
+        high = highs[i]
+        low = lows[i]
+        volume = 0
+        j = i
+        while j < n and (times[j] - times[0]) // period == bucket:
+            if highs[j] > high:
+                high = highs[j]
+            if lows[j] < low:
+                low = lows[j]
+            volume += volumes[j]
+            j += 1
+
+        # Unvollständige Perioden verwerfen (weniger als factor 1m Kerzen)
+        if j - i >= factor:
+            out_time[count] = times[i]
+            out_open[count] = opens[i]
+            out_high[count] = high
+            out_low[count] = low
+            out_close[count] = closes[j - 1]
+            out_volume[count] = volume
+            count += 1
+        i = j
+
+    return (out_time[:count], out_open[:count], out_high[:count],
+            out_low[:count], out_close[:count], out_volume[:count])
+
+
+def _aggregate_reduceat(times, opens, highs, lows, closes, volumes, factor):
+    """Vektorisierte OHLCV Reduktion via ufunc.reduceat - Fallback ohne Numba"""
+    buckets = (times - times[0]) // (factor * 60)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    counts = np.diff(np.r_[starts, len(times)])
+    ends = starts + counts - 1
+    complete = counts >= factor
+
+    return (times[starts][complete],
+            opens[starts][complete],
+            np.maximum.reduceat(highs, starts)[complete],
+            np.minimum.reduceat(lows, starts)[complete],
+            closes[ends][complete],
+            np.add.reduceat(volumes, starts)[complete])
+
+
+_aggregate_kernel = njit(cache=True)(_aggregate_loop) if njit is not None else _aggregate_reduceat
+
+
+def aggregate_to_higher_tf(times: np.ndarray, opens: np.ndarray, highs: np.ndarray,
+                           lows: np.ndarray, closes: np.ndarray, volumes: np.ndarray,
+                           factor: int) -> Tuple[np.ndarray, ...]:
+    """
+    Aggregiert chronologisch sortierte 1m Kerzen zu factor-Minuten Kerzen
+
+    Perioden werden zeitbasiert ab der ersten Kerze gebildet (wie das bisherige
+    pandas groupby), unvollständige Perioden werden verworfen.
+
+    Args:
+        times: Unix Timestamps in Sekunden (aufsteigend sortiert)
+        opens, highs, lows, closes: Preise der 1m Kerzen
+        volumes: Volumen der 1m Kerzen
+        factor: Anzahl 1m Kerzen pro Ziel-Kerze (z.B. 5 für 5m)
+
+    Returns:
+        Tuple (time, open, high, low, close, volume) als NumPy Arrays
+    """
+    times = np.ascontiguousarray(times, dtype=np.int64)
+    opens = np.ascontiguousarray(opens, dtype=np.float64)
+    highs = np.ascontiguousarray(highs, dtype=np.float64)
+    lows = np.ascontiguousarray(lows, dtype=np.float64)
+    closes = np.ascontiguousarray(closes, dtype=np.float64)
+    volumes = np.ascontiguousarray(volumes, dtype=np.int64)
+
+    if len(times) == 0:
+        return (times, opens, highs, lows, closes, volumes)
+
+    return _aggregate_kernel(times, opens, highs, lows, closes, volumes, int(factor))
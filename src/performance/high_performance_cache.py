@@ -14,6 +14,8 @@ from typing import Dict, List, Optional, Tuple, Any
 from collections import OrderedDict
 from datetime import datetime, timedelta
 
+from .candle_aggregation import aggregate_to_higher_tf
+
 
 class HighPerformanceChartCache:
     """
@@ -53,6 +55,9 @@ class HighPerformanceChartCache:
             "4h": 240
         }
 
+        # Integer-IDs pro Timeframe für schnelle Cache-Keys (tuple-of-ints Hash)
+        self.timeframe_ids = {tf: i for i, tf in enumerate(self.timeframe_multipliers)}
+
         # Intelligent Caching System
         self.visible_cache: OrderedDict = OrderedDict()  # LRU Cache für aktuelle Sichtbereiche
         self.cache_size_mb = cache_size_mb
@@ -159,7 +164,9 @@ class HighPerformanceChartCache:
                     df['datetime'] = pd.to_datetime(df['time'], unit='s')
 
             # Sortierung nach Zeit sicherstellen
-            df = df.sort_values('datetime').reset_index(drop=True)
+            if not df['datetime'].is_monotonic_increasing:
+                df = df.sort_values('datetime')
+            df = df.reset_index(drop=True)
 
             # Data Quality Validation
             if len(df) == 0:
@@ -198,19 +205,17 @@ class HighPerformanceChartCache:
         start_time = time.time()
 
         # Date-to-Index Map (String-basiert)
-        self.date_index_map = {}
-        self.datetime_index_map = {}
+        # Spaltenweise statt iterrows() - keine Series pro 1m Kerze
+        datetimes = self.master_1m_data['datetime']
+        indices = self.master_1m_data.index
 
-        for idx, row in self.master_1m_data.iterrows():
-            dt = row['datetime']
-            date_str = dt.strftime('%Y-%m-%d')
+        # Für jeden Tag: Index der ersten Kerze dieses Tages (Daten sind nach Zeit sortiert)
+        date_strings = datetimes.dt.strftime('%Y-%m-%d')
+        first_of_day = ~date_strings.duplicated().to_numpy()
+        self.date_index_map = dict(zip(date_strings[first_of_day].tolist(), indices[first_of_day].tolist()))
 
-            # Für jeden Tag: Speichere Index der ersten Kerze dieses Tages
-            if date_str not in self.date_index_map:
-                self.date_index_map[date_str] = idx
-
-            # Datetime-basiert für präzise Lookups
-            self.datetime_index_map[dt] = idx
+        # Datetime-basiert für präzise Lookups
+        self.datetime_index_map = dict(zip(datetimes.tolist(), indices.tolist()))
 
         build_time = time.time() - start_time
         print(f"[HIGH-PERF-CACHE] Index Maps built in {build_time*1000:.0f}ms")
@@ -230,7 +235,7 @@ class HighPerformanceChartCache:
         operation_start = time.time()
 
         # Cache Key für LRU Cache
-        cache_key = f"{timeframe}_{target_date}_{candle_count}"
+        cache_key = self._cache_key(timeframe, target_date, candle_count)
 
         # Hot Cache Check
         if cache_key in self.visible_cache:
@@ -238,7 +243,12 @@ class HighPerformanceChartCache:
             self.visible_cache.move_to_end(cache_key)
             self.cache_hits += 1
 
-            result = self.visible_cache[cache_key]
+            cached = self.visible_cache[cache_key]
+            result = {
+                'data': self._columns_to_candles(cached['columns']),
+                'visible_range': cached['visible_range'],
+                'performance_stats': dict(cached['performance_stats'])
+            }
             operation_time = time.time() - operation_start
             result['performance_stats']['response_time_ms'] = operation_time * 1000
             result['performance_stats']['cache_hit'] = True
@@ -292,26 +302,17 @@ class HighPerformanceChartCache:
         aggregation_time = time.time() - aggregation_start
         self.operation_times['aggregation'].append(aggregation_time)
 
-        # Prepare Result
-        result_data = []
-        for _, row in aggregated_data.iterrows():
-            result_data.append({
-                'time': int(row['time']),
-                'open': float(row['open']),
-                'high': float(row['high']),
-                'low': float(row['low']),
-                'close': float(row['close']),
-                'volume': int(row.get('volume', 0))
-            })
+        # Prepare Result - spaltenweise NumPy Arrays (SoA) statt Dict pro Kerze
+        columns = self._extract_columns(aggregated_data)
+        result_data = self._columns_to_candles(columns)
 
         # Calculate Visible Range (last 50 candles für Chart display)
-        visible_count = min(50, len(result_data))
+        times = columns[0]
+        visible_count = min(50, len(times))
         if visible_count > 0:
-            start_time_visible = result_data[-visible_count]['time']
-            end_time_visible = result_data[-1]['time']
             visible_range = {
-                'from': start_time_visible,
-                'to': end_time_visible
+                'from': int(times[-visible_count]),
+                'to': int(times[-1])
             }
         else:
             visible_range = None
@@ -335,14 +336,54 @@ class HighPerformanceChartCache:
             'performance_stats': performance_stats
         }
 
-        # Cache Result (LRU Management)
-        self._cache_with_lru(cache_key, result)
+        # Cache Result (LRU Management) - nur die kompakten Spalten, keine Dict-Liste
+        self._cache_with_lru(cache_key, {
+            'columns': columns,
+            'visible_range': visible_range,
+            'performance_stats': performance_stats
+        })
 
         # Background: Predictive Pre-loading
         self._trigger_predictive_preload(timeframe, target_date, candle_count)
 
         return result
 
+    @staticmethod
+    def _extract_columns(df: pd.DataFrame) -> Tuple[np.ndarray, ...]:
+        """
+        Extrahiert OHLCV als zusammenhängende NumPy Arrays (time, open, high, low, close, volume)
+
+        Ein Cache-Eintrag hält damit 6 Arrays statt N Python-Dicts im Speicher.
+        """
+        volume = df['volume'].to_numpy(dtype=np.int64) if 'volume' in df.columns else np.zeros(len(df), dtype=np.int64)
+        return (
+            df['time'].to_numpy(dtype=np.int64),
+            df['open'].to_numpy(dtype=np.float64),
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            volume
+        )
+
+    @staticmethod
+    def _columns_to_candles(columns: Tuple[np.ndarray, ...]) -> List[Dict[str, Any]]:
+        """Baut das Chart-Format (Liste von Candle-Dicts) aus den gecachten Spalten"""
+        return [
+            {'time': t, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+            for t, o, h, l, c, v in zip(*(column.tolist() for column in columns))
+        ]
+
+    def _cache_key(self, timeframe: str, target_date: str, candle_count: int) -> Tuple[Any, str, int]:
+        """
+        Baut den LRU Cache Key als Tuple - kein String-Formatting pro Request
+
+        target_date bleibt als String im Key: eindeutig auch für nicht
+        zero-gepaddete Daten, ungültige Daten laufen in den Fallback in
+        get_timeframe_data statt beim Key-Bau zu scheitern.
+        """
+        tf_id = self.timeframe_ids.get(timeframe, timeframe)
+        return (tf_id, target_date, candle_count)
+
     def _aggregate_to_timeframe(self, df_1m: pd.DataFrame, timeframe: str) -> pd.DataFrame:
         """
         High-Performance OHLCV Aggregation
@@ -359,46 +400,35 @@ class HighPerformanceChartCache:
 
         multiplier = self.timeframe_multipliers[timeframe]
 
-        # Time-based aggregation für korrekte Timestamps
-        df = df_1m.copy().reset_index(drop=True)
-
         # Sortiere nach datetime für korrekte chronologische Reihenfolge
-        df = df.sort_values('datetime').reset_index(drop=True)
-
-        # Create time-based groups using datetime
-        df['minutes_from_start'] = (df['datetime'] - df['datetime'].iloc[0]).dt.total_seconds() / 60
-        df['group'] = (df['minutes_from_start'] // multiplier).astype(int)
-
-        # Remove incomplete last group
-        group_counts = df.groupby('group').size()
-        complete_groups = group_counts[group_counts >= multiplier].index
-        df = df[df['group'].isin(complete_groups)]
-
-        if len(df) == 0:
-            # Return empty DataFrame with correct structure
-            return pd.DataFrame(columns=['datetime', 'time', 'open', 'high', 'low', 'close', 'volume'])
-
-        # OHLCV Aggregation with correct timestamps
-        aggregated = df.groupby('group').agg({
-            'datetime': 'first',  # First datetime of each timeframe period
-            'time': 'first',      # First timestamp of each timeframe period
-            'open': 'first',      # First open
-            'high': 'max',        # Maximum high
-            'low': 'min',         # Minimum low
-            'close': 'last',      # Last close
-            'volume': 'sum'       # Sum volume
-        }).reset_index(drop=True)
-
-        return aggregated
-
-    def _cache_with_lru(self, cache_key: str, result: Dict[str, Any]):
+        # (Master-Daten sind bereits beim Laden sortiert - O(N) Check statt Sortierung)
+        df = df_1m if df_1m['datetime'].is_monotonic_increasing else df_1m.sort_values('datetime')
+
+        volume = df['volume'] if 'volume' in df.columns else np.zeros(len(df), dtype=np.int64)
+        times, opens, highs, lows, closes, volumes = aggregate_to_higher_tf(
+            df['time'].to_numpy(), df['open'].to_numpy(), df['high'].to_numpy(),
+            df['low'].to_numpy(), df['close'].to_numpy(), np.asarray(volume), multiplier
+        )
+
+        # OHLCV Aggregation with correct timestamps (erster Timestamp jeder Periode)
+        return pd.DataFrame({
+            'datetime': pd.to_datetime(times, unit='s'),
+            'time': times,
+            'open': opens,
+            'high': highs,
+            'low': lows,
+            'close': closes,
+            'volume': volumes
+        })
+
+    def _cache_with_lru(self, cache_key: Tuple[Any, str, int], entry: Dict[str, Any]):
         """LRU Cache Management mit Memory Limit"""
 
         # Add to cache
-        self.visible_cache[cache_key] = result
+        self.visible_cache[cache_key] = entry
 
         # Estimate memory usage (rough)
-        estimated_mb = len(result['data']) * 0.001  # ~1KB per candle
+        estimated_mb = sum(column.nbytes for column in entry['columns']) / 1024 / 1024
 
         # LRU Cleanup wenn Cache zu groß
         while len(self.visible_cache) > 100:  # Max 100 cached ranges
@@ -436,7 +466,7 @@ class HighPerformanceChartCache:
                 timeframe, date, candle_count = self.preload_queue.pop(0)
 
             # Preload if not already cached
-            cache_key = f"{timeframe}_{date}_{candle_count}"
+            cache_key = self._cache_key(timeframe, date, candle_count)
             if cache_key not in self.visible_cache:
                 try:
                     # Silent preload
@@ -0,0 +1,154 @@
+"""
+Indicator Kernels
+=================
+Letzter Wert von RSI und MACD auf reinen NumPy Arrays. Das Environment braucht
+pro Step nur den aktuellen Indikatorwert - statt pandas pct_change/where/ewm
+Serien über das Fenster aufzubauen, reduziert eine Schleife das Fenster direkt.
+Gleitende Mittelwerte/Standardabweichungen werden einmal für die ganze Serie
+in O(N) vorberechnet. Mit installiertem Numba werden die Schleifen JIT-kompiliert.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba ist optional - Fallback auf reines Python
+    njit = None
+
+
+def _rsi_loop(close, idx, period):
+    """RSI über close[idx-period:idx+1] - gleiche Mittelung wie die pandas Variante"""
+    gains = 0.0
+    losses = 0.0
+    for i in range(idx - period + 1, idx + 1):
+        change = close[i] / close[i - 1] - 1.0
+        if change > 0:
+            gains += change
+        elif change < 0:
+            losses -= change
+
+    if losses == 0:
+        return 1.0
+
+    # pandas mittelt über period + 1 Werte (erster pct_change Wert wird zu 0)
+    rs = (gains / (period + 1)) / (losses / (period + 1))
+    return 1.0 - 1.0 / (1.0 + rs)
+
+
+def _ewm_last(values, start, end, span):
+    """Letzter Wert von Series.ewm(span=span).mean() (adjust=True) über values[start:end]"""
+    decay = 1.0 - 2.0 / (span + 1.0)
+    weighted = 0.0
+    weights = 0.0
+    for i in range(start, end):
+        weighted = values[i] + decay * weighted
+        weights = 1.0 + decay * weights
+    return weighted / weights
+
+
+def _macd_loop(close, idx, lookback):
+    """Normalisiertes MACD Signal (EMA12 - EMA26) über close[idx-lookback:idx+1]"""
+    start = max(0, idx - lookback)
+    macd = _ewm_last(close, start, idx + 1, 12) - _ewm_last(close, start, idx + 1, 26)
+    return np.tanh(macd / close[idx] * 100)
+
+
+def _rolling_mean_std_loop(values, window):
+    """
+    Gleitender Mittelwert und Standardabweichung (ddof=1) über values[k:k+window]
+
+    Welford-Update beim Hinzufügen/Entfernen je eines Werts - O(N) statt O(N·window).
+    NaN Werte werden wie bei pandas mean()/std() übersprungen.
+    """
+    n = len(values) - window + 1
+    means = np.full(max(n, 0), np.nan)
+    stds = np.full(max(n, 0), np.nan)
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(len(values)):
+        x = values[i]
+        if not math.isnan(x):
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+
+        if i >= window:
+            old = values[i - window]
+            if not math.isnan(old):
+                if count == 1:
+                    count = 0
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    delta = old - mean
+                    mean -= delta / (count - 1)
+                    m2 -= delta * (old - mean)
+                    count -= 1
+
+        k = i - window + 1
+        if k >= 0:
+            if count > 0:
+                means[k] = mean
+            if count > 1:
+                stds[k] = math.sqrt(max(m2, 0.0) / (count - 1))
+    return means, stds
+
+
+if njit is not None:
+    _ewm_last = njit(cache=True)(_ewm_last)
+    _rsi_kernel = njit(cache=True)(_rsi_loop)
+    _macd_kernel = njit(cache=True)(_macd_loop)
+    _rolling_kernel = njit(cache=True)(_rolling_mean_std_loop)
+else:
+    _rsi_kernel = _rsi_loop
+    _macd_kernel = _macd_loop
+    _rolling_kernel = _rolling_mean_std_loop
+
+
+def rsi_last(close: np.ndarray, idx: int, period: int = 14) -> float:
+    """
+    RSI (0-1 skaliert) für Position idx
+
+    Args:
+        close: Schlusskurse als float64 Array
+        idx: Aktuelle Position (>= period)
+        period: RSI Periode
+
+    Returns:
+        RSI im Bereich [0, 1]
+    """
+    return float(_rsi_kernel(close, int(idx), int(period)))
+
+
+def macd_signal_last(close: np.ndarray, idx: int, lookback: int = 50) -> float:
+    """
+    MACD Signal (tanh-normalisiert auf [-1, 1]) für Position idx
+
+    Args:
+        close: Schlusskurse als float64 Array
+        idx: Aktuelle Position
+        lookback: Fensterlänge für die EMA-Berechnung
+
+    Returns:
+        Normalisiertes MACD Signal
+    """
+    return float(_macd_kernel(close, int(idx), int(lookback)))
+
+
+def rolling_mean_std(values: np.ndarray, window: int):
+    """
+    Gleitender Mittelwert und Standardabweichung für die ganze Serie
+
+    Args:
+        values: Werte als Array (NaN werden übersprungen)
+        window: Fensterlänge
+
+    Returns:
+        (means, stds) Arrays der Länge len(values) - window + 1,
+        Eintrag k entspricht dem Fenster values[k:k+window]
+    """
+    return _rolling_kernel(np.asarray(values, dtype=np.float64), int(window))
@@ -5,10 +5,81 @@ Kommunikation zwischen Streamlit und FastAPI Chart Server
 
 import requests
 import json
+import numpy as np
 from typing import Dict, Any, Optional, List
 import logging
 from datetime import datetime
 
+from data.chart_candles import candle_columns, candle_records
+
+try:
+    import orjson
+except ImportError:  # orjson ist optional - Fallback auf stdlib json
+    orjson = None
+
+
+def dataframe_to_chart_data(df) -> List[Dict[str, Any]]:
+    """
+    Vektorisierte Konvertierung eines OHLC DataFrames (DatetimeIndex) ins TradingView Format
+
+    Timestamps und Preise werden spaltenweise extrahiert statt pro Zeile über
+    iterrows() - liefert identische Werte wie int(idx.timestamp()) / float(row[...]).
+
+    Args:
+        df: DataFrame mit DatetimeIndex und Open/High/Low/Close Spalten
+
+    Returns:
+        Liste von Chart-Daten Dictionaries
+    """
+    return candle_records(df, volume=False)
+
+
+_CHART_COLUMNS = ('time', 'open', 'high', 'low', 'close')
+
+
+def arrays_to_chart_columns(arrays: Dict[str, np.ndarray]) -> Dict[str, List]:
+    """
+    Struct-of-Arrays Payload ({'time': [...], 'open': [...], ...}) für den Chart Server
+
+    Die Keys stehen nur einmal statt pro Kerze im JSON - kleinerer Payload und
+    kein Python-Dict pro Kerze beim Serialisieren.
+
+    Args:
+        arrays: Dict mit 'time', 'open', 'high', 'low', 'close' Arrays
+
+    Returns:
+        Dict mit einer Liste pro Chart-Spalte
+    """
+    return {key: np.asarray(arrays[key]).tolist() for key in _CHART_COLUMNS}
+
+
+def dataframe_to_chart_columns(df) -> Dict[str, List]:
+    """
+    Struct-of-Arrays Payload direkt aus einem OHLC DataFrame (DatetimeIndex)
+
+    Args:
+        df: DataFrame mit DatetimeIndex und Open/High/Low/Close Spalten
+
+    Returns:
+        Dict mit einer Liste pro Chart-Spalte
+    """
+    return candle_columns(df, volume=False)
+
+
+def dumps_chart_payload(payload: Any) -> str:
+    """
+    Serialisiert Chart-Payloads mit orjson (falls installiert), sonst stdlib json
+
+    Args:
+        payload: JSON-serialisierbares Objekt (Listen/Dicts, NumPy Arrays mit orjson)
+
+    Returns:
+        JSON-String
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    return json.dumps(payload)
+
 
 class ChartService:
     """Service für Communication mit FastAPI Chart Server"""
@@ -19,12 +90,15 @@ class ChartService:
         # Timeout für API Calls
         self.timeout = 5
 
-    def set_chart_data(self, data: List[Dict], symbol: str = "NQ=F", interval: str = "5m") -> bool:
+    def set_chart_data(self, data, symbol: str = "NQ=F", interval: str = "5m") -> bool:
         """
         Sendet initiale Chart-Daten an FastAPI Server
 
+        Die Kerzen gehen spaltenweise (Struct-of-Arrays) über die Leitung, der
+        Server baut daraus wieder Kerzen-Objekte (columns_to_candles).
+
         Args:
-            data: Chart-Daten im TradingView Format
+            data: Chart-Spalten (siehe arrays_to_chart_columns) oder Kerzen im TradingView Format
             symbol: Trading Symbol
             interval: Zeitintervall
 
@@ -32,21 +106,27 @@ class ChartService:
             True wenn erfolgreich, False bei Fehler
         """
         try:
+            if isinstance(data, dict):
+                columns = data
+            else:
+                columns = {key: [candle.get(key) for candle in data] for key in _CHART_COLUMNS}
+
             payload = {
-                "data": data,
+                "columns": columns,
                 "symbol": symbol,
                 "interval": interval
             }
 
             response = self.session.post(
                 f"{self.base_url}/api/chart/set_data",
-                json=payload,
+                data=dumps_chart_payload(payload),
+                headers={"Content-Type": "application/json"},
                 timeout=self.timeout
             )
 
             if response.status_code == 200:
                 result = response.json()
-                logging.info(f"Chart data sent successfully: {len(data)} candles")
+                logging.info(f"Chart data sent successfully: {len(columns['time'])} candles")
                 return True
             else:
                 logging.error(f"Failed to set chart data: {response.status_code}")
@@ -137,18 +217,22 @@ class ChartService:
         Returns:
             Liste von Chart-Daten Dictionaries
         """
-        chart_data = []
-
-        for idx, row in df.iterrows():
-            chart_data.append({
-                'time': int(idx.timestamp()),
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close'])
-            })
-
-        return chart_data
+        return dataframe_to_chart_data(df)
+
+    def convert_market_data_to_chart_columns(self, data_dict: Dict[str, Any]) -> Dict[str, List]:
+        """
+        Konvertiert ein Marktdaten-Dictionary zu spaltenweisen Chart-Daten für set_chart_data
+
+        Args:
+            data_dict: Marktdaten mit 'data' und optional 'arrays'
+
+        Returns:
+            Dict mit einer Liste pro Chart-Spalte
+        """
+        arrays = data_dict.get('arrays')
+        if arrays is not None:
+            return arrays_to_chart_columns(arrays)
+        return dataframe_to_chart_columns(data_dict['data'])
 
     def create_candle_from_row(self, row, timestamp) -> Dict[str, Any]:
         """
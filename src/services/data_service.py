@@ -10,8 +10,8 @@ import pandas as pd
 from datetime import datetime, timedelta
 import pytz
 
-from data.yahoo_finance import get_yfinance_data
-from config.settings import DEFAULT_SESSION_STATE
+from data.yahoo_finance import get_yfinance_data, clear_yfinance_cache
+from config.settings import DEFAULT_SESSION_STATE, DATA_CONFIG
 
 
 class DataService:
@@ -50,16 +50,50 @@ class DataService:
             default_interval = DEFAULT_SESSION_STATE['selected_interval']
 
             with st.spinner(f'⚡ Lade Standard-Asset {default_symbol}...'):
-                data_dict = self.get_market_data(default_symbol, period="5d",
+                data_dict = self.get_market_data(default_symbol, period=DATA_CONFIG['default_period'],
                                                interval=default_interval)
                 if data_dict:
                     st.session_state['data_dict'] = data_dict
+                    # Chart liest live_data - Refresh ersetzt die Live-Daten des aktuellen Keys
+                    st.session_state['live_data'] = data_dict
+                    st.session_state['live_data_key'] = (symbol, interval)
                     st.success(f'✅ {default_symbol} Daten geladen!')
 
-    def refresh_data(self) -> bool:
+    def ensure_live_data(self, symbol: str, interval: str) -> Optional[Dict[str, Any]]:
+        """
+        Lädt Live-Daten nur wenn sich (Symbol, Intervall) geändert hat
+
+        Der Key der geladenen Daten liegt in st.session_state['live_data_key'] -
+        reine UI-Reruns mit gleichem Symbol/Intervall lösen keinen Fetch aus.
+
+        Args:
+            symbol: Trading Symbol
+            interval: Chart-Intervall
+
+        Returns:
+            Aktuelle Live-Daten oder None bei Fehler
+        """
+        live_data_key = (symbol, interval)
+        if st.session_state.get('live_data_key') == live_data_key:
+            return st.session_state.get('live_data')
+
+        with st.spinner(f'⚡ Lade {symbol} Daten...'):
+            data_dict = self.get_market_data(symbol, period=DATA_CONFIG['default_period'],
+                                             interval=interval)
+
+        if data_dict:
+            st.session_state['live_data'] = data_dict
+            st.session_state['live_data_key'] = live_data_key
+        return data_dict
+
+    def refresh_data(self, force: bool = False) -> bool:
         """
         Aktualisiert aktuelle Daten im Session State
 
+        Args:
+            force: yfinance Cache verwerfen (expliziter "Daten aktualisieren" Klick) -
+                ohne force liefern Auto-Refresh Ticks innerhalb der TTL gecachte Daten
+
         Returns:
             True wenn erfolgreich, False bei Fehler
         """
@@ -67,8 +101,11 @@ class DataService:
             symbol = st.session_state['selected_symbol']
             interval = st.session_state['selected_interval']
 
+            if force:
+                clear_yfinance_cache()
+
             with st.spinner(f'🔄 Aktualisiere {symbol} Daten...'):
-                data_dict = self.get_market_data(symbol, period="5d", interval=interval)
+                data_dict = self.get_market_data(symbol, period=DATA_CONFIG['default_period'], interval=interval)
                 if data_dict:
                     st.session_state['data_dict'] = data_dict
                     st.success(f'✅ {symbol} Daten aktualisiert!')
@@ -176,11 +213,16 @@ class DataService:
         Returns:
             Aktueller Close-Preis oder None
         """
-        if not data_dict or 'df' not in data_dict:
+        if not data_dict:
             return None
 
-        df = data_dict['df']
-        if len(df) > 0:
+        # Vorberechnete Close-Spalte (yfinance Daten) - kein DataFrame-Zugriff nötig
+        arrays = data_dict.get('arrays')
+        if arrays is not None:
+            return float(arrays['close'][-1]) if len(arrays['close']) > 0 else None
+
+        df = data_dict.get('data', data_dict.get('df'))
+        if df is not None and len(df) > 0:
             return float(df['Close'].iloc[-1])
         return None
 
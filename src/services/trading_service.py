@@ -5,11 +5,15 @@ Implementiert Command Pattern und Strategy Pattern für erweiterbare Trading Log
 """
 
 from typing import Dict, Any, List, Optional, Tuple
+from collections import deque
+import calendar
 from datetime import datetime, timedelta
 import streamlit as st
 import pandas as pd
 import pytz
 
+from config.settings import RECENT_TRADES_LIMIT
+
 
 class TradingService:
     """Service für alle Trading-Operationen - Single Responsibility"""
@@ -50,8 +54,11 @@ class TradingService:
             st.session_state['trades'] = []
 
         # Neuen Trade erstellen
+        timestamp = datetime.now(self.timezone)
         trade = {
-            'timestamp': datetime.now(self.timezone),
+            'timestamp': timestamp,
+            # Chart-Zeitachse: Berliner Wanduhrzeit als UTC-Sekunden wie bei den Kerzen - einmalig beim Anlegen
+            'time': calendar.timegm(timestamp.replace(tzinfo=None).timetuple()),
             'action': action.upper(),
             'price': float(price),
             'quantity': int(quantity),
@@ -60,8 +67,11 @@ class TradingService:
             'pnl': 0.0  # Wird bei Close-Trades berechnet
         }
 
-        # Trade hinzufügen
+        # Trade hinzufügen (volle Historie + begrenzter Puffer für die Anzeige)
         st.session_state['trades'].append(trade)
+        if 'recent_trades' not in st.session_state:
+            st.session_state['recent_trades'] = deque(maxlen=RECENT_TRADES_LIMIT)
+        st.session_state['recent_trades'].appendleft(trade)
 
         # Portfolio-Statistiken aktualisieren
         self._update_portfolio_stats()
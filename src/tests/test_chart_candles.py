@@ -0,0 +1,50 @@
+"""
+Tests für die gemeinsame Chart-Kerzen Konvertierung
+"""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from data.chart_candles import candle_columns, candle_records
+
+
+class TestCandleRecords:
+    """Test Suite für candle_columns / candle_records"""
+
+    @pytest.fixture
+    def df(self):
+        """Zwei 5m Kerzen mit naivem DatetimeIndex"""
+        return pd.DataFrame({'Open': [1.25, 2.5], 'High': [3.0, 4.0], 'Low': [0.5, 1.5], 'Close': [2.0, 3.75],
+                            'Volume': [10, 20]},
+                           index=pd.date_range('2024-01-02 09:30', periods=2, freq='5min'))
+
+    def test_matches_row_conversion(self, df):
+        """Ergebnis entspricht der zeilenweisen Konvertierung per iterrows()"""
+        expected = [
+            {'time': int(idx.timestamp()), 'open': float(row['Open']), 'high': float(row['High']),
+             'low': float(row['Low']), 'close': float(row['Close']), 'volume': int(row['Volume'])}
+            for idx, row in df.iterrows()
+        ]
+
+        assert candle_records(df) == expected
+
+    def test_volume_optional(self, df):
+        """Ohne Volume-Spalte wird 0 eingetragen, volume=False lässt das Feld weg"""
+        assert [candle['volume'] for candle in candle_records(df.drop(columns='Volume'))] == [0, 0]
+        assert 'volume' not in candle_records(df, volume=False)[0]
+
+    def test_custom_times_and_extra_fields(self, df):
+        """Eigene Zeitwerte und zusätzliche Felder werden pro Kerze übernommen"""
+        records = candle_records(df, times=[1.5, 2.5], extra={'timeframe': ['5m', '5m']})
+
+        assert [candle['time'] for candle in records] == [1.5, 2.5]
+        assert [candle['timeframe'] for candle in records] == ['5m', '5m']
+
+    def test_empty_df(self):
+        """Leerer DataFrame ergibt leere Spalten bzw. keine Kerzen"""
+        assert candle_records(pd.DataFrame()) == []
+        assert candle_columns(None, volume=False) == {'time': [], 'open': [], 'high': [], 'low': [], 'close': []}
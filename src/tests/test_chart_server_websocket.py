@@ -173,6 +173,21 @@ class TestChartServerWebSocket:
         except Exception as e:
             pytest.fail(f"WebSocket serialization failed: {e}")
 
+    def test_initial_data_sent_as_columns(self, client):
+        """Test: initial_data überträgt Kerzen spaltenweise (Struct-of-Arrays)"""
+        candles = chart_server.manager.chart_state['data']
+
+        with client.websocket_connect("/ws") as websocket:
+            message = websocket.receive_json()
+
+        assert message['type'] == 'initial_data'
+        assert 'data' not in message['data']
+        columns = message['data']['columns']
+        assert set(columns) == {'time', 'open', 'high', 'low', 'close', 'volume'}
+        assert all(len(values) == len(candles) for values in columns.values())
+        if candles:
+            assert columns['close'][-1] == candles[-1]['close']
+
     def test_invalid_timeframe_handling(self, client):
         """Test: Ungültige Timeframes werden korrekt behandelt"""
         # Test ungültigen Timeframe
@@ -0,0 +1,29 @@
+"""
+Tests für Chart Service Hilfsfunktionen
+Testet die Konvertierung der OHLC-Historien in Chart-Daten
+"""
+
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from services.chart_service import dataframe_to_chart_data, arrays_to_chart_columns, dataframe_to_chart_columns
+from data.yahoo_finance import ohlcv_arrays
+
+
+class TestOhlcvArrays:
+    """Test Suite für die vorberechneten OHLCV Spalten"""
+
+    def test_columns_match_chart_data(self):
+        """Spaltenweiser Payload enthält dieselben Kerzen wie dataframe_to_chart_data"""
+        df = pd.DataFrame({'Open': [1.25, 2.5], 'High': [3.0, 4.0], 'Low': [0.5, 1.5], 'Close': [2.0, 3.75],
+                           'Volume': [10, 20]},
+                          index=pd.date_range('2024-01-02 09:30', periods=2, freq='5min', tz='Europe/Berlin'))
+        columns = dataframe_to_chart_columns(df)
+        candles = [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+        assert candles == dataframe_to_chart_data(df)
+        assert arrays_to_chart_columns(ohlcv_arrays(df)) == columns
+
@@ -7,6 +7,7 @@ import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
 import pandas as pd
+import numpy as np
 import pytz
 
 import sys
@@ -95,6 +96,46 @@ class TestDataService(unittest.TestCase):
                 # Assert
                 self.assertTrue(result)
                 self.assertEqual(mock_session_state['data_dict']['symbol'], 'NQ=F')
+                self.assertEqual(mock_session_state['live_data']['symbol'], 'NQ=F')
+                self.assertEqual(mock_session_state['live_data_key'], ('NQ=F', '5m'))
+
+    @patch('streamlit.session_state', new_callable=dict)
+    @patch('services.data_service.clear_yfinance_cache')
+    def test_refresh_data_force_clears_cache(self, mock_clear_cache, mock_session_state):
+        """Test: Expliziter Refresh verwirft den yfinance Cache, Auto-Refresh nicht"""
+        mock_session_state.update({
+            'selected_symbol': 'NQ=F',
+            'selected_interval': '5m'
+        })
+
+        with patch.object(self.data_service, 'get_market_data') as mock_get_data:
+            mock_get_data.return_value = {'symbol': 'NQ=F'}
+
+            with patch('streamlit.spinner'), patch('streamlit.success'):
+                self.data_service.refresh_data()
+                mock_clear_cache.assert_not_called()
+
+                self.data_service.refresh_data(force=True)
+                mock_clear_cache.assert_called_once()
+
+    @patch('streamlit.session_state', new_callable=dict)
+    @patch('streamlit.spinner')
+    def test_ensure_live_data_fetches_only_on_key_change(self, mock_spinner, mock_session_state):
+        """Test: Live-Daten werden nur bei geändertem (Symbol, Intervall) neu geladen"""
+        with patch.object(self.data_service, 'get_market_data') as mock_get_data:
+            mock_get_data.return_value = {'symbol': 'NQ=F'}
+
+            # Act
+            self.data_service.ensure_live_data('NQ=F', '5m')
+            result = self.data_service.ensure_live_data('NQ=F', '5m')
+
+            # Assert
+            self.assertEqual(result['symbol'], 'NQ=F')
+            self.assertEqual(mock_session_state['live_data_key'], ('NQ=F', '5m'))
+            mock_get_data.assert_called_once()
+
+            self.data_service.ensure_live_data('NQ=F', '15m')
+            self.assertEqual(mock_get_data.call_count, 2)
 
     def test_get_latest_price_success(self):
         """Test: Extraktion des neuesten Preises"""
@@ -108,6 +149,14 @@ class TestDataService(unittest.TestCase):
         # Assert
         self.assertEqual(latest_price, 15520.0)
 
+    def test_get_latest_price_from_market_data(self):
+        """Test: Preis aus yfinance Dictionary ('data' DataFrame bzw. 'arrays' Spalten)"""
+        df = pd.DataFrame({'Close': [15500.0, 15520.0]})
+        self.assertEqual(self.data_service.get_latest_price({'data': df}), 15520.0)
+
+        arrays = {'close': np.array([15500.0, 15530.0])}
+        self.assertEqual(self.data_service.get_latest_price({'data': df, 'arrays': arrays}), 15530.0)
+
     def test_get_latest_price_invalid_data(self):
         """Test: Handling von ungültigen Daten"""
         # Empty data
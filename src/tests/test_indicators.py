@@ -0,0 +1,87 @@
+"""
+Tests für Indicator Kernels
+===========================
+Vergleicht RSI/MACD Kernel mit der bisherigen pandas Berechnung aus dem Environment
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from performance import indicators
+from performance.indicators import rsi_last, macd_signal_last, rolling_mean_std
+
+
+def _pandas_rsi(close, idx, period=14):
+    """Bisherige InteractiveTradingEnv._calculate_rsi Berechnung"""
+    price_changes = close.iloc[idx-period:idx+1].pct_change()
+    gains = price_changes.where(price_changes > 0, 0)
+    losses = -price_changes.where(price_changes < 0, 0)
+    avg_gain = gains.mean()
+    avg_loss = losses.mean()
+    if avg_loss == 0:
+        return 1.0
+    rs = avg_gain / avg_loss
+    return 1 - (1 / (1 + rs))
+
+
+def _pandas_macd(close, idx):
+    """Bisherige InteractiveTradingEnv._calculate_macd_signal Berechnung"""
+    prices = close.iloc[max(0, idx-50):idx+1]
+    ema12 = prices.ewm(span=12).mean().iloc[-1]
+    ema26 = prices.ewm(span=26).mean().iloc[-1]
+    return np.tanh((ema12 - ema26) / prices.iloc[-1] * 100)
+
+
+class TestIndicators:
+    """Test Suite für rsi_last / macd_signal_last"""
+
+    @pytest.fixture
+    def close(self):
+        """Random Walk Schlusskurse"""
+        rng = np.random.default_rng(7)
+        return pd.Series(20000 + np.cumsum(rng.normal(0, 5, 300)))
+
+    @pytest.mark.parametrize("idx", [14, 30, 51, 299])
+    def test_rsi_matches_pandas(self, close, idx):
+        """RSI Kernel entspricht der pandas Referenz"""
+        assert rsi_last(close.to_numpy(), idx) == pytest.approx(_pandas_rsi(close, idx))
+
+    @pytest.mark.parametrize("idx", [26, 40, 50, 299])
+    def test_macd_matches_pandas(self, close, idx):
+        """MACD Kernel entspricht der pandas Referenz (auch bei kurzem Fenster)"""
+        assert macd_signal_last(close.to_numpy(), idx) == pytest.approx(_pandas_macd(close, idx))
+
+    def test_rsi_without_losses(self):
+        """Nur steigende Kurse liefern RSI 1.0"""
+        close = np.arange(100.0, 130.0)
+        assert rsi_last(close, 20) == 1.0
+
+    def test_python_fallback(self, close):
+        """Reine Python Schleifen liefern dasselbe Ergebnis wie die Kernel"""
+        values = close.to_numpy()
+        assert indicators._rsi_loop(values, 100, 14) == pytest.approx(rsi_last(values, 100))
+        assert indicators._macd_loop(values, 100, 50) == pytest.approx(macd_signal_last(values, 100))
+
+    @pytest.mark.parametrize("window", [5, 20])
+    def test_rolling_mean_std_matches_pandas(self, close, window):
+        """Rolling Kernel entspricht pandas mean()/std() je Fenster (inkl. führendem NaN)"""
+        returns = close.pct_change()
+        means, stds = rolling_mean_std(returns.to_numpy(), window)
+
+        assert len(means) == len(returns) - window + 1
+        for k in [0, 1, 50, len(means) - 1]:
+            assert means[k] == pytest.approx(returns.iloc[k:k+window].mean())
+            assert stds[k] == pytest.approx(returns.iloc[k:k+window].std())
+
+    def test_rolling_python_fallback(self, close):
+        """Reine Python Schleife liefert dasselbe Ergebnis wie der Kernel"""
+        values = close.pct_change().to_numpy()
+        expected_means, expected_stds = rolling_mean_std(values, 20)
+        means, stds = indicators._rolling_mean_std_loop(values, 20)
+        np.testing.assert_allclose(means, expected_means)
+        np.testing.assert_allclose(stds, expected_stds)
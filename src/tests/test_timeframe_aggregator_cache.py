@@ -0,0 +1,167 @@
+"""
+Tests für TimeframeAggregator File Cache
+Testet atomares Schreiben und Laden der JSON Cache-Dateien
+"""
+
+import pytest
+import json
+import os
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from data import timeframe_aggregator
+from data.timeframe_aggregator import TimeframeAggregator
+
+
+class TestTimeframeAggregatorCache:
+    """Test Suite für save_to_cache / load_from_cache"""
+
+    @pytest.fixture
+    def aggregator(self, tmp_path):
+        """Aggregator mit temporärem Cache-Verzeichnis"""
+        return TimeframeAggregator(cache_dir=str(tmp_path))
+
+    @pytest.fixture
+    def candles(self):
+        """Kleine Kerzenliste im Chart-Format"""
+        return [
+            {'time': 1733011200 + i * 300, 'open': 100.0 + i, 'high': 101.0 + i,
+             'low': 99.0 + i, 'close': 100.5 + i, 'volume': 1000 + i}
+            for i in range(10)
+        ]
+
+    def test_save_writes_valid_json(self, aggregator, candles):
+        """Cache-Datei enthält exakt die gespeicherten Kerzen"""
+        aggregator.save_to_cache('5m_a_b', candles)
+
+        with open(aggregator.get_cache_filename('5m_a_b')) as f:
+            assert json.load(f) == candles
+
+    def test_no_tmp_file_left(self, aggregator, candles, tmp_path):
+        """Nach dem Speichern bleibt keine .tmp Datei zurück"""
+        aggregator.save_to_cache('5m_a_b', candles)
+        aggregator.save_to_cache('5m_a_b', candles[:3])
+
+        assert not any(name.endswith('.tmp') for name in os.listdir(tmp_path))
+
+    def test_file_cache_roundtrip(self, aggregator, candles, tmp_path):
+        """Neue Instanz lädt die Daten aus dem File Cache"""
+        aggregator.save_to_cache('15m_a_b', candles)
+
+        fresh = TimeframeAggregator(cache_dir=str(tmp_path))
+        assert fresh.load_from_cache('15m_a_b') == candles
+
+    def test_unchanged_save_skips_write(self, aggregator, candles):
+        """Identischer Payload wird nicht erneut geschrieben"""
+        aggregator.save_to_cache('5m_a_b', candles)
+        cache_file = aggregator.get_cache_filename('5m_a_b')
+        os.utime(cache_file, ns=(0, 0))
+
+        aggregator.save_to_cache('5m_a_b', list(candles))
+        assert os.stat(cache_file).st_mtime_ns == 0
+
+        aggregator.save_to_cache('5m_a_b', candles[:5])
+        assert os.stat(cache_file).st_mtime_ns != 0
+        with open(cache_file) as f:
+            assert json.load(f) == candles[:5]
+
+    def test_write_behind_coalesces_saves(self, aggregator, candles):
+        """Verzögerte Saves landen erst nach flush_cache auf Disk - nur der letzte Stand"""
+        aggregator.write_behind_delay = 60
+        cache_file = aggregator.get_cache_filename('1h_a_b')
+
+        for i in range(1, 6):
+            aggregator.save_to_cache('1h_a_b', candles[:i], flush=False)
+
+        assert not os.path.exists(cache_file)
+        assert aggregator.load_from_cache('1h_a_b') == candles[:5]
+
+        aggregator.flush_cache()
+        with open(cache_file) as f:
+            assert json.load(f) == candles[:5]
+
+    def test_write_behind_timer_flushes(self, aggregator, candles):
+        """Der Timer schreibt gepufferte Saves nach write_behind_delay"""
+        aggregator.write_behind_delay = 0.1
+        aggregator.save_to_cache('2m_a_b', candles, flush=False)
+        timer = aggregator._flush_timer
+        timer.join(timeout=2)
+
+        assert os.path.exists(aggregator.get_cache_filename('2m_a_b'))
+
+    def test_exit_flush_covers_pending_writes(self, aggregator, candles):
+        """Der gemeinsame atexit-Flush schreibt gepufferte Saves lebender Aggregatoren"""
+        aggregator.write_behind_delay = 60
+        aggregator.save_to_cache('3m_a_b', candles, flush=False)
+
+        timeframe_aggregator._flush_all_aggregators()
+
+        assert os.path.exists(aggregator.get_cache_filename('3m_a_b'))
+
+    def test_aggregator_not_kept_alive(self, tmp_path):
+        """Instanzen werden nicht bis zum Prozessende festgehalten"""
+        import gc
+        TimeframeAggregator(cache_dir=str(tmp_path))
+        gc.collect()
+
+        assert not any(agg.cache_dir == str(tmp_path) for agg in timeframe_aggregator._live_aggregators)
+
+    def test_unchanged_file_not_reparsed(self, aggregator, candles, tmp_path, monkeypatch):
+        """Neue Instanz nutzt geparste Daten solange mtime/Größe der Datei gleich bleiben"""
+        aggregator.save_to_cache('30m_a_b', candles)
+
+        def fail_parse(*args, **kwargs):
+            raise AssertionError("Datei wurde erneut geparst")
+
+        monkeypatch.setattr(timeframe_aggregator, '_read_cache_file', fail_parse)
+        fresh = TimeframeAggregator(cache_dir=str(tmp_path))
+        assert fresh.load_from_cache('30m_a_b') == candles
+
+    def test_parsed_data_not_shared_between_instances(self, aggregator, candles, tmp_path):
+        """Instanzen erhalten eigene Listen - Änderungen schlagen nicht auf andere durch"""
+        aggregator.save_to_cache('1h_a_b', candles)
+
+        first = TimeframeAggregator(cache_dir=str(tmp_path)).load_from_cache('1h_a_b')
+        first.append({'time': 0})
+        second = TimeframeAggregator(cache_dir=str(tmp_path)).load_from_cache('1h_a_b')
+
+        assert first is not second
+        assert second == candles
+
+    def test_parsed_cache_files_bounded(self, aggregator, candles, monkeypatch):
+        """Der Parse-Cache hält höchstens _PARSED_CACHE_FILES_LIMIT Dateien"""
+        monkeypatch.setattr(timeframe_aggregator, '_PARSED_CACHE_FILES_LIMIT', 2)
+        for i in range(4):
+            aggregator.save_to_cache(f'5m_a_{i}', candles)
+
+        assert len(timeframe_aggregator._parsed_cache_files) == 2
+        assert aggregator.get_cache_filename('5m_a_3') in timeframe_aggregator._parsed_cache_files
+
+    def test_externally_modified_file_reparsed(self, aggregator, candles, tmp_path):
+        """Extern geänderte Datei (neue mtime/Größe) wird neu geparst"""
+        aggregator.save_to_cache('4h_a_b', candles)
+        cache_file = aggregator.get_cache_filename('4h_a_b')
+        with open(cache_file, 'w') as f:
+            json.dump(candles[:2], f)
+
+        fresh = TimeframeAggregator(cache_dir=str(tmp_path))
+        assert fresh.load_from_cache('4h_a_b') == candles[:2]
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_read_large_cache_file(self, aggregator, tmp_path, monkeypatch, use_orjson):
+        """Große Cache-Dateien (mmap Pfad) und stdlib Fallback liefern identische Daten"""
+        if not use_orjson:
+            monkeypatch.setattr(timeframe_aggregator, 'orjson', None)
+        elif timeframe_aggregator.orjson is None:
+            pytest.skip("orjson nicht installiert")
+
+        candles = [{'time': 1733011200 + i * 60, 'open': 100.25, 'high': 101.5,
+                    'low': 99.75, 'close': 100.5, 'volume': i} for i in range(2000)]
+        cache_file = str(tmp_path / 'big.json')
+        with open(cache_file, 'w') as f:
+            json.dump(candles, f)
+
+        assert os.path.getsize(cache_file) >= timeframe_aggregator._MMAP_THRESHOLD
+        assert timeframe_aggregator._read_cache_file(cache_file) == candles
@@ -7,12 +7,14 @@ import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timezone
 import pytz
+import pandas as pd
 
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from services.trading_service import TradingService
+from data.yahoo_finance import ohlcv_arrays
 
 
 class TestTradingService(unittest.TestCase):
@@ -44,6 +46,46 @@ class TestTradingService(unittest.TestCase):
         self.assertEqual(trade['source'], 'Manual')
         self.assertEqual(trade['symbol'], 'NQ=F')
 
+    @patch('streamlit.session_state', new_callable=dict)
+    def test_trade_time_matches_candle_time(self, mock_session_state):
+        """Test: Trade-Zeit folgt der Zeitachse der Chart-Kerzen"""
+        # Arrange
+        mock_session_state.update({
+            'trades': [],
+            'selected_symbol': 'NQ=F'
+        })
+
+        # Act
+        with patch('streamlit.success'):
+            self.trading_service.add_trade('BUY', 15500.0, 'Manual')
+
+        # Assert - Kerzen-Index wie in yahoo_finance: Berliner Zeit ohne Zeitzone
+        trade = mock_session_state['trades'][0]
+        index = pd.DatetimeIndex([trade['timestamp']]).tz_convert('Europe/Berlin').tz_localize(None)
+        candle = pd.DataFrame({'Open': [1.0], 'High': [1.0], 'Low': [1.0], 'Close': [1.0]}, index=index)
+        self.assertEqual(trade['time'], int(ohlcv_arrays(candle)['time'][0]))
+
+    @patch('streamlit.session_state', new_callable=dict)
+    def test_recent_trades_bounded_newest_first(self, mock_session_state):
+        """Test: recent_trades hält nur die letzten Trades, neueste zuerst"""
+        # Arrange
+        mock_session_state.update({
+            'trades': [],
+            'selected_symbol': 'NQ=F'
+        })
+
+        # Act
+        with patch('streamlit.success'):
+            for i in range(15):
+                self.trading_service.add_trade('BUY', 15500.0 + i, 'Manual')
+
+        # Assert
+        recent = list(mock_session_state['recent_trades'])
+        self.assertEqual(len(mock_session_state['trades']), 15)
+        self.assertEqual(len(recent), 10)
+        self.assertEqual(recent[0]['price'], 15514.0)
+        self.assertEqual(recent[-1]['price'], 15505.0)
+
     @patch('streamlit.session_state', new_callable=dict)
     def test_add_trade_validation_failure(self, mock_session_state):
         """Test: Trade-Validierung schlägt fehl"""
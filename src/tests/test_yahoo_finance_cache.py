@@ -0,0 +1,165 @@
+"""
+Tests für den inkrementellen yfinance History-Cache und get_yfinance_data
+Testet Delta-Download, Zusammenführen, Fallback ohne Cache und den gecachten Download
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from data import yahoo_finance
+from data.yahoo_finance import _load_history, _trim_to_period, get_yfinance_data, clear_yfinance_cache
+
+
+def _bars(start, periods, close=100.0):
+    """5m Kerzen in Börsen-Zeitzone wie von ticker.history()"""
+    index = pd.date_range(start, periods=periods, freq='5min', tz='America/New_York')
+    values = np.full(periods, close)
+    return pd.DataFrame({'Open': values, 'High': values + 1, 'Low': values - 1,
+                         'Close': values, 'Volume': np.arange(periods)}, index=index)
+
+
+def _recent_start():
+    """Start einer Kerzenfolge, deren letzte Kerze innerhalb von period liegt"""
+    return pd.Timestamp.now(tz='America/New_York').floor('5min') - pd.Timedelta(hours=2)
+
+
+class FakeTicker:
+    """Zeichnet history() Aufrufe auf und liefert vorbereitete Antworten"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def history(self, **kwargs):
+        self.calls.append(kwargs)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class TestHistoryCache:
+    """Test Suite für _load_history"""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        """History-Cache in temporäres Verzeichnis umleiten"""
+        pytest.importorskip("pyarrow")
+        monkeypatch.setitem(yahoo_finance.DATA_CONFIG, 'history_cache_dir', str(tmp_path))
+        return tmp_path
+
+    def test_first_load_downloads_full_period(self, cache_dir):
+        """Ohne Cache wird die volle Periode geladen und gespeichert"""
+        full = _bars('2024-01-02 09:30', 10)
+        ticker = FakeTicker(full)
+
+        hist = _load_history(ticker, 'NQ=F', '5d', '5m')
+
+        assert ticker.calls == [{'period': '5d', 'interval': '5m'}]
+        pd.testing.assert_frame_equal(hist, full, check_freq=False)
+        assert (cache_dir / 'NQ_F_5d_5m.parquet').exists()
+
+    def test_second_load_fetches_delta_only(self):
+        """Mit Cache wird nur ab der letzten Kerze nachgeladen und angehängt"""
+        full = _bars(_recent_start(), 10)
+        delta = _bars(full.index[-1], 3, close=200.0)  # aktualisierte letzte Kerze + 2 neue
+        ticker = FakeTicker(full, delta)
+
+        _load_history(ticker, 'NQ=F', '5d', '5m')
+        hist = _load_history(ticker, 'NQ=F', '5d', '5m')
+
+        assert ticker.calls[1] == {'start': full.index[-1], 'interval': '5m'}
+        assert len(hist) == 12
+        assert hist.index.is_unique and hist.index.is_monotonic_increasing
+        assert hist['Close'].iloc[9] == 200.0
+
+    def test_stale_cache_downloads_full_period(self):
+        """Cache außerhalb von period / Yahoos Intraday-Fenster: kein Delta, voller Download"""
+        stale = _bars('2024-01-02 09:30', 10)
+        fresh = _bars(_recent_start(), 10, close=200.0)
+        ticker = FakeTicker(stale, fresh)
+
+        _load_history(ticker, 'NQ=F', '5d', '5m')
+        hist = _load_history(ticker, 'NQ=F', '5d', '5m')
+
+        assert ticker.calls[1] == {'period': '5d', 'interval': '5m'}
+        pd.testing.assert_frame_equal(hist, fresh, check_freq=False)
+
+    def test_empty_delta_downloads_full_period(self):
+        """Leeres Delta wird nicht als aktueller Stand übernommen"""
+        full = _bars(_recent_start(), 10)
+        refreshed = _bars(_recent_start(), 12, close=200.0)
+        ticker = FakeTicker(full, full.iloc[:0], refreshed)
+
+        _load_history(ticker, 'NQ=F', '5d', '5m')
+        hist = _load_history(ticker, 'NQ=F', '5d', '5m')
+
+        assert ticker.calls[2] == {'period': '5d', 'interval': '5m'}
+        assert len(hist) == 12
+
+    def test_cache_disabled(self, monkeypatch, cache_dir):
+        """history_cache_dir=None lädt immer die volle Periode"""
+        monkeypatch.setitem(yahoo_finance.DATA_CONFIG, 'history_cache_dir', None)
+        ticker = FakeTicker(_bars('2024-01-02 09:30', 5), _bars('2024-01-02 09:30', 5))
+
+        _load_history(ticker, 'AAPL', '1d', '5m')
+        _load_history(ticker, 'AAPL', '1d', '5m')
+
+        assert all('period' in call for call in ticker.calls)
+        assert not any(cache_dir.iterdir())
+
+    def test_trim_to_trading_days(self):
+        """"Nd" behält die letzten N Handelstage"""
+        hist = pd.concat([_bars('2024-01-02 09:30', 3), _bars('2024-01-03 09:30', 3),
+                          _bars('2024-01-04 09:30', 3)])
+
+        assert _trim_to_period(hist, '2d').index[0].day == 3
+        assert len(_trim_to_period(hist, '5d')) == 9
+        assert len(_trim_to_period(hist, '1mo')) == 9
+
+
+class TestGetYfinanceData:
+    """Test Suite für get_yfinance_data über den gecachten Download"""
+
+    @pytest.fixture(autouse=True)
+    def no_history_cache(self, monkeypatch):
+        """Ohne Parquet-Cache und mit leerem Download-Cache"""
+        monkeypatch.setitem(yahoo_finance.DATA_CONFIG, 'history_cache_dir', None)
+        monkeypatch.setattr(yahoo_finance.st, 'error', lambda message: None)
+        clear_yfinance_cache()
+        yield
+        clear_yfinance_cache()
+
+    def test_returns_data_dict(self, monkeypatch):
+        """Erfolgreicher Download liefert das Daten-Dictionary (kein Tuple)"""
+        monkeypatch.setitem(yahoo_finance._TICKERS, 'TEST1', FakeTicker(_bars(_recent_start(), 5, close=150.0)))
+
+        data_dict = get_yfinance_data('TEST1', '1d', '5m')
+
+        assert isinstance(data_dict, dict)
+        assert len(data_dict['data']) == 5
+        assert data_dict['current_price'] == 150.0
+        assert data_dict['arrays']['close'][-1] == 150.0
+
+    def test_with_quote_overrides_current_price(self, monkeypatch):
+        """with_quote setzt current_price aus dem Live-Quote"""
+        monkeypatch.setitem(yahoo_finance._TICKERS, 'TEST2', FakeTicker(_bars(_recent_start(), 5)))
+        monkeypatch.setattr(yahoo_finance, 'get_last_price', lambda symbol: 123.5)
+
+        data_dict = get_yfinance_data('TEST2', '1d', '5m', with_quote=True)
+
+        assert data_dict['current_price'] == 123.5
+
+    def test_errors_are_not_cached(self, monkeypatch):
+        """Ein fehlgeschlagener Download wird beim nächsten Aufruf wiederholt"""
+        ticker = FakeTicker(ConnectionError("offline"), _bars(_recent_start(), 5))
+        monkeypatch.setitem(yahoo_finance._TICKERS, 'TEST3', ticker)
+
+        assert get_yfinance_data('TEST3', '1d', '5m') is None
+        assert get_yfinance_data('TEST3', '1d', '5m') is not None
+        assert len(ticker.calls) == 2
@@ -3,6 +3,8 @@ Asset-Definitionen und Konstanten
 Verfügbare Trading Assets nach Kategorien organisiert
 """
 
+from types import MappingProxyType
+
 # Available Assets Configuration - erweitert und strukturiert
 AVAILABLE_ASSETS = {
     "futures": [
@@ -53,32 +55,27 @@ AVAILABLE_ASSETS = {
     ]
 }
 
+# Symbol -> Asset Lookup einmalig beim Import aufgebaut (unveränderlich)
+ASSETS_BY_SYMBOL = MappingProxyType({
+    asset["symbol"]: asset
+    for category in AVAILABLE_ASSETS.values()
+    for asset in category
+})
+
 def validate_symbol(symbol):
     """Prüft ob Symbol in verfügbaren Assets existiert"""
-    for category in AVAILABLE_ASSETS.values():
-        for asset in category:
-            if asset["symbol"] == symbol:
-                return True
-    return False
+    return symbol in ASSETS_BY_SYMBOL
 
 def get_asset_info(symbol):
     """Gibt Asset-Informationen für ein Symbol zurück"""
-    for category in AVAILABLE_ASSETS.values():
-        for asset in category:
-            if asset["symbol"] == symbol:
-                return asset
-    return None
+    return ASSETS_BY_SYMBOL.get(symbol)
 
 def get_all_symbols():
     """Gibt alle verfügbaren Symbole als Liste zurück"""
-    symbols = []
-    for category in AVAILABLE_ASSETS.values():
-        for asset in category:
-            symbols.append(asset["symbol"])
-    return symbols
+    return list(ASSETS_BY_SYMBOL)
 
 def get_symbols_by_category(category):
     """Gibt Symbole einer bestimmten Kategorie zurück"""
     if category in AVAILABLE_ASSETS:
         return [asset["symbol"] for asset in AVAILABLE_ASSETS[category]]
-    return []
\ No newline at end of file
+    return []